@@ -21,6 +21,7 @@ from ._astropy_init import *
 # For egg_info test builds to pass, put package imports here.
 if not _ASTROPY_SETUP_:
     from .utils import *
+    from .cache import *
     from .observer import *
     from .target import *
     from .exceptions import *
@@ -28,5 +29,6 @@ if not _ASTROPY_SETUP_:
     from .constraints import *
     from .scheduling import *
     from .periodic import *
+    from .profiling import *
 
     get_IERS_A_or_workaround()
@@ -0,0 +1,471 @@
+# Licensed under a 3-clause BSD style license - see LICENSE.rst
+"""
+A bounded cache for expensive intermediate results, such as alt/az
+coordinates, computed for an `~astroplan.Observer`, and a persistent cache
+of ephemerides on disk.
+"""
+
+from __future__ import (absolute_import, division, print_function,
+                        unicode_literals)
+
+# Standard library
+from collections import OrderedDict
+import datetime
+import hashlib
+import os
+import sys
+import tempfile
+import threading
+
+# Third-party
+import numpy as np
+import six
+from astropy.time import Time
+from astropy.coordinates import BaseCoordinateFrame, SkyCoord
+try:
+    from astropy.coordinates import (BaseRepresentationOrDifferential as
+                                     _BaseRepresentation)
+except ImportError:
+    # astropy < 2.0 has no differentials
+    from astropy.coordinates import BaseRepresentation as _BaseRepresentation
+import astropy.units as u
+
+# Package
+from .profiling import _profilers, _record
+
+__all__ = ["ObserverCache", "EphemerisDiskCache"]
+
+#: Default memory budget for an `ObserverCache`, in bytes (256 MiB)
+DEFAULT_CACHE_MAX_BYTES = 256 * 1024**2
+
+
+# Types whose `repr` is complete, so that equal reprs mean equal values
+_EXACT_REPR_TYPES = ((type(None), bool, float, complex, bytes, np.generic,
+                      u.UnitBase, datetime.date, datetime.time,
+                      datetime.timedelta) +
+                     six.string_types + six.integer_types)
+
+
+class _UndigestibleError(TypeError):
+    """
+    Raised by `_digest` for values which cannot be digested.
+    """
+
+
+def _digest(*values):
+    """
+    Compute a fixed-size digest of array buffers and simple values.
+
+    The digest is used to build cache keys whose size, and therefore the
+    cost of hashing and comparing them, does not depend on the length of
+    the arrays.
+
+    Parameters
+    ----------
+    values : `~numpy.ndarray`, `~astropy.time.Time`, coordinates, or simple
+        values
+        The values to digest. The dtype, shape and unit of arrays, the scale
+        of times and the frame of coordinates are part of the digest. Lists,
+        tuples and dicts, and objects without a custom `repr`, are digested
+        item by item.
+
+    Returns
+    -------
+    digest : str
+        Hexadecimal SHA-1 digest of ``values``
+
+    Raises
+    ------
+    _UndigestibleError
+        If one of ``values`` is an object with a custom `repr` which is not
+        known to represent it completely, e.g. because it shortens large
+        arrays.
+    """
+    sha = hashlib.sha1()
+    for value in values:
+        _update_digest(sha, value)
+    return sha.hexdigest()
+
+
+def _update_digest(sha, value):
+    """
+    Feed ``value`` into the hash object ``sha``; see `_digest`.
+    """
+    if isinstance(value, Time):
+        _update_digest(sha, value.scale)
+        _update_digest(sha, value.jd1)
+        _update_digest(sha, value.jd2)
+    elif isinstance(value, (SkyCoord, BaseCoordinateFrame)):
+        frame = getattr(value, 'frame', value)
+        _update_digest(sha, frame.name)
+        _update_digest(sha, [getattr(frame, attr) for attr in
+                             sorted(frame.get_frame_attr_names())])
+        _update_digest(sha, frame.data if frame.has_data else None)
+    elif isinstance(value, _BaseRepresentation):
+        _update_digest(sha, value.__class__.__name__)
+        _update_digest(sha, [getattr(value, component)
+                             for component in value.components])
+        _update_digest(sha, getattr(value, 'differentials', {}))
+    elif isinstance(value, np.ndarray) and value.dtype != object:
+        header = "{}{}{}".format(value.dtype, value.shape,
+                                 getattr(value, 'unit', ''))
+        sha.update(header.encode('utf-8'))
+        sha.update(np.ascontiguousarray(value).view(np.uint8))
+    elif isinstance(value, (list, tuple)):
+        sha.update("{}{}".format(type(value).__name__,
+                                 len(value)).encode('utf-8'))
+        for item in value:
+            _update_digest(sha, item)
+    elif isinstance(value, dict):
+        _update_digest(sha, sorted(value.items(),
+                                   key=lambda item: repr(item[0])))
+    elif (type(value).__repr__ is object.__repr__ and
+            hasattr(value, '__dict__')):
+        # the default repr contains the address of the object, so digest
+        # its class and attributes instead, e.g. for the periodic events of
+        # phase constraints
+        _update_digest(sha, type(value).__module__)
+        _update_digest(sha, type(value).__name__)
+        _update_digest(sha, vars(value))
+    elif isinstance(value, _EXACT_REPR_TYPES):
+        sha.update(repr(value).encode('utf-8'))
+    else:
+        # other reprs may be abbreviated, e.g. for large arrays, and do not
+        # identify the value
+        raise _UndigestibleError("cannot digest {} object"
+                                 .format(type(value).__name__))
+
+
+def _estimate_nbytes(value):
+    """
+    Estimate the memory footprint of ``value`` in bytes.
+
+    Only the large array buffers are counted, which is what dominates the
+    memory use of cached coordinates and times. Containers are traversed
+    recursively.
+
+    Parameters
+    ----------
+    value : object
+        Cached object: a `~numpy.ndarray` (including
+        `~astropy.units.Quantity`), `~astropy.time.Time`, coordinate
+        frame or `~astropy.coordinates.SkyCoord`, or a `dict`, `list` or
+        `tuple` of those.
+
+    Returns
+    -------
+    nbytes : int
+        Estimated size of ``value`` in bytes
+    """
+    if isinstance(value, np.ndarray):
+        # broadcast arrays repeat the elements of a smaller buffer along the
+        # axes with a zero stride, so count that buffer only
+        if 0 in value.strides:
+            return value.itemsize * int(np.prod(
+                [n for n, stride in zip(value.shape, value.strides)
+                 if stride != 0]))
+        return value.nbytes
+
+    if isinstance(value, Time):
+        return _estimate_nbytes(value.jd1) + _estimate_nbytes(value.jd2)
+
+    if isinstance(value, dict):
+        return sum(_estimate_nbytes(v) for v in value.values())
+
+    if isinstance(value, (list, tuple)):
+        return sum(_estimate_nbytes(v) for v in value)
+
+    # coordinate frames and SkyCoords: count the representation data and
+    # any array-valued frame attributes, like ``obstime``
+    frame = getattr(value, 'frame', value)
+    data = getattr(frame, '_data', None)
+    if data is not None and hasattr(data, 'components'):
+        nbytes = sum(_estimate_nbytes(getattr(data, component))
+                     for component in data.components)
+        for attr in frame.get_frame_attr_names():
+            attr_value = getattr(frame, attr, None)
+            if isinstance(attr_value, (np.ndarray, Time)):
+                nbytes += _estimate_nbytes(attr_value)
+        return nbytes
+
+    return sys.getsizeof(value)
+
+
+class ObserverCache(object):
+    """
+    A least-recently-used cache with a memory budget.
+
+    Each `~astroplan.Observer` owns one of these to store intermediate
+    results, like the alt/az coordinates of targets or the position of
+    the Moon on a grid of times, which are reused between constraints.
+    When the estimated size of the cached results exceeds ``max_bytes``,
+    the least recently used entries are evicted. The cache can be used from
+    several threads at once. Pickled copies of the cache are empty.
+
+    Examples
+    --------
+    >>> from astroplan import Observer
+    >>> import astropy.units as u
+    >>> subaru = Observer.at_site("Subaru", cache_max_bytes=64*1024**2)
+    >>> subaru.cache.max_bytes
+    67108864
+    >>> subaru.cache.clear()
+    """
+
+    def __init__(self, max_bytes=DEFAULT_CACHE_MAX_BYTES):
+        """
+        Parameters
+        ----------
+        max_bytes : int (optional)
+            Memory budget of the cache, in bytes. Defaults to 256 MiB.
+            Results larger than this are never cached.
+        """
+        self.max_bytes = int(max_bytes)
+        self._entries = OrderedDict()
+        self._sizes = {}
+        self.current_bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._lock = threading.RLock()
+
+    def __getstate__(self):
+        # locks cannot be pickled, and the cached results are not sent along
+        # with an observer to worker processes, which start with an empty
+        # cache of the same budget
+        state = self.__dict__.copy()
+        del state['_lock']
+        state.update(_entries=OrderedDict(), _sizes={}, current_bytes=0)
+        return state
+
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        self._lock = threading.RLock()
+
+    def __repr__(self):
+        return ("<{}: {} entries, {} of {} bytes, hits={}, misses={}, "
+                "evictions={}>".format(self.__class__.__name__, len(self),
+                                       self.current_bytes, self.max_bytes,
+                                       self.hits, self.misses,
+                                       self.evictions))
+
+    def __len__(self):
+        return len(self._entries)
+
+    def __contains__(self, key):
+        return key in self._entries
+
+    def get(self, key, default=None):
+        """
+        Retrieve a cached result and mark it as recently used.
+
+        Parameters
+        ----------
+        key : tuple
+            Hashable key of the cached result.
+        default : object (optional)
+            Returned when ``key`` is not in the cache.
+
+        Returns
+        -------
+        value : object
+            The cached result, or ``default``.
+        """
+        if _profilers and isinstance(key, tuple):
+            _record('cache:{0}'.format(key[0]), hit=key in self._entries)
+
+        with self._lock:
+            if key not in self._entries:
+                self.misses += 1
+                return default
+
+            self.hits += 1
+            value = self._entries.pop(key)
+            self._entries[key] = value
+            return value
+
+    def items(self):
+        """
+        List the cached entries, from least to most recently used.
+
+        Unlike `get`, this does not mark the entries as used and does not
+        change the hit/miss counters, which makes it suitable for scanning
+        the cache for reusable results.
+
+        Returns
+        -------
+        items : list of tuple
+            List of ``(key, value)`` pairs
+        """
+        with self._lock:
+            return list(self._entries.items())
+
+    def set(self, key, value):
+        """
+        Store a result in the cache, evicting the least recently used
+        entries if the memory budget would be exceeded.
+
+        Parameters
+        ----------
+        key : tuple
+            Hashable key for the result.
+        value : object
+            The result to cache.
+        """
+        nbytes = _estimate_nbytes(value)
+        with self._lock:
+            if key in self._entries:
+                self._remove(key)
+
+            if nbytes > self.max_bytes:
+                return
+
+            while (self._entries and
+                   self.current_bytes + nbytes > self.max_bytes):
+                oldest_key = next(iter(self._entries))
+                self._remove(oldest_key)
+                self.evictions += 1
+
+            self._entries[key] = value
+            self._sizes[key] = nbytes
+            self.current_bytes += nbytes
+
+    def _remove(self, key):
+        del self._entries[key]
+        self.current_bytes -= self._sizes.pop(key)
+
+    def clear(self):
+        """
+        Remove all cached results. The hit/miss/eviction counters are kept.
+        """
+        with self._lock:
+            self._entries.clear()
+            self._sizes.clear()
+            self.current_bytes = 0
+
+    def reset_stats(self):
+        """
+        Reset the hit, miss and eviction counters to zero.
+        """
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    @property
+    def stats(self):
+        """
+        Summary of the cache usage.
+
+        Returns
+        -------
+        stats : dict
+            Dictionary with the number of ``'hits'``, ``'misses'`` and
+            ``'evictions'``, the number of ``'entries'``, and the
+            ``'current_bytes'`` and ``'max_bytes'`` memory use and budget.
+        """
+        return dict(hits=self.hits, misses=self.misses,
+                    evictions=self.evictions, entries=len(self),
+                    current_bytes=self.current_bytes,
+                    max_bytes=self.max_bytes)
+
+
+class EphemerisDiskCache(object):
+    """
+    A persistent cache of ephemerides, such as the positions of the Sun and
+    Moon, stored as NumPy ``.npy`` files in a directory.
+
+    Each array is stored in a file named after a digest of the location of
+    the observer, the grid of times and the name of the ephemeris, and is
+    read back as a read-only memory-mapped array. Several processes, e.g.
+    workers evaluating constraints for the same site and times, can share
+    one directory, so that only the first computes the ephemerides.
+
+    Examples
+    --------
+    >>> from astroplan import Observer, EphemerisDiskCache
+    >>> disk_cache = EphemerisDiskCache("ephemerides") # doctest: +SKIP
+    >>> subaru = Observer.at_site("Subaru",
+    ...                           ephemeris_cache=disk_cache) # doctest: +SKIP
+    """
+
+    def __init__(self, directory):
+        """
+        Parameters
+        ----------
+        directory : str
+            Directory of the cached files. It is created if it does not
+            exist.
+        """
+        self.directory = directory
+        if not os.path.isdir(directory):
+            os.makedirs(directory)
+
+    def __repr__(self):
+        return "<{}: {!r}>".format(self.__class__.__name__, self.directory)
+
+    def _path(self, location, times, name):
+        digest = _digest(np.array([value.to('m').value for value in
+                                   location.to_geocentric()]),
+                         times, name)
+        return os.path.join(self.directory, digest + '.npy')
+
+    def get(self, location, times, name):
+        """
+        Retrieve a cached array.
+
+        Parameters
+        ----------
+        location : `~astropy.coordinates.EarthLocation`
+            Location of the observer.
+        times : `~astropy.time.Time`
+            Grid of times of the ephemeris.
+        name : tuple or str
+            Name of the ephemeris, with any parameter it depends on.
+
+        Returns
+        -------
+        array : `~numpy.ndarray` or `None`
+            Read-only memory-mapped array, or `None` if the array is not in
+            the cache.
+        """
+        path = self._path(location, times, name)
+        if not os.path.exists(path):
+            return None
+        return np.load(path, mmap_mode='r')
+
+    def set(self, location, times, name, array):
+        """
+        Store an array in the cache.
+
+        The array is written to a temporary file which is then renamed, so
+        that other processes never read a partially written file.
+
+        Parameters
+        ----------
+        location : `~astropy.coordinates.EarthLocation`
+            Location of the observer.
+        times : `~astropy.time.Time`
+            Grid of times of the ephemeris.
+        name : tuple or str
+            Name of the ephemeris, with any parameter it depends on.
+        array : `~numpy.ndarray`
+            The array to store.
+        """
+        path = self._path(location, times, name)
+        fd, temporary_path = tempfile.mkstemp(dir=self.directory,
+                                              suffix='.npy.tmp')
+        try:
+            with os.fdopen(fd, 'wb') as f:
+                np.save(f, np.asarray(array))
+            getattr(os, 'replace', os.rename)(temporary_path, path)
+        except Exception:
+            os.remove(temporary_path)
+            raise
+
+    def clear(self):
+        """
+        Remove all cached files.
+        """
+        for filename in os.listdir(self.directory):
+            if filename.endswith('.npy'):
+                os.remove(os.path.join(self.directory, filename))
@@ -10,19 +10,33 @@ from __future__ import (absolute_import, division, print_function,
 # Standard library
 from abc import ABCMeta, abstractmethod
 import datetime
+import functools
+from timeit import default_timer
 import warnings
 
 # Third-party
 from astropy.time import Time
 import astropy.units as u
-from astropy.coordinates import get_body, get_sun, get_moon, Galactic, SkyCoord
+from astropy.coordinates import (get_sun, get_moon, Galactic, GCRS,
+                                 SkyCoord, PrecessedGeocentric, Longitude,
+                                 solar_system_ephemeris,
+                                 UnitSphericalRepresentation,
+                                 CartesianRepresentation)
 from astropy import table
+try:
+    import erfa
+except ImportError:
+    # astropy < 4.2 bundles its own copy of ERFA
+    from astropy import _erfa as erfa
 
 import numpy as np
 from numpy.lib.stride_tricks import as_strided
 
 # Package
-from .moon import moon_illumination
+from .cache import _digest, _UndigestibleError
+from .parallel import _map_shards, _n_workers
+from .profiling import _profilers, _record, _size
+from .moon import _moon_illumination_from_coords
 from .utils import time_grid_from_range
 from .target import get_skycoord
 
@@ -33,7 +47,56 @@ __all__ = ["AltitudeConstraint", "AirmassConstraint", "AtNightConstraint",
            "LocalTimeConstraint", "PrimaryEclipseConstraint",
            "SecondaryEclipseConstraint", "Constraint", "TimeConstraint",
            "observability_table", "months_observable", "max_best_rescale",
-           "min_best_rescale", "PhaseConstraint", "is_event_observable"]
+           "min_best_rescale", "PhaseConstraint", "is_event_observable",
+           "EphemerisGrid", "observability_windows",
+           "iter_observability_table", "event_observability_table"]
+
+
+def _make_time_key(times):
+    """
+    Make a hashable key for the array of ``times``.
+
+    The key contains the shape and scale of ``times`` and a fixed-size digest
+    of the underlying Julian Date arrays, so its size does not depend on the
+    number of times.
+
+    Parameters
+    ----------
+    times : `~astropy.time.Time`
+        Array of times on which to test the constraint.
+
+    Returns
+    -------
+    time_key : tuple
+        A hashable tuple for use in a cache key
+    """
+    return (times.shape, times.scale, _digest(times.jd1, times.jd2))
+
+
+def _make_target_key(targets):
+    """
+    Make a hashable key for ``targets``.
+
+    For coordinates, the key contains the frame name, the shape and a
+    fixed-size digest of all of the components of the coordinate data
+    (e.g. longitude *and* latitude) together with the frame attributes.
+
+    Parameters
+    ----------
+    targets : `~astropy.coordinates.SkyCoord` or str
+        Target or list of targets, or a string naming a special target like
+        ``'moon'``.
+
+    Returns
+    -------
+    target_key : tuple
+        A hashable tuple for use in a cache key
+    """
+    if not hasattr(targets, 'frame'):
+        # assume targets is a string.
+        return (targets,)
+
+    return (targets.frame.name, targets.shape, _digest(targets))
 
 
 def _make_cache_key(times, targets):
@@ -45,6 +108,10 @@ def _make_cache_key(times, targets):
     routine will provide an appropriate, hashable, key to store these
     calculations in a dictionary.
 
+    The key is built from fixed-size digests of the underlying arrays, so the
+    cost of computing, hashing and comparing it is independent of the number
+    of ``times`` and ``targets``.
+
     Parameters
     ----------
     times : `~astropy.time.Time`
@@ -57,24 +124,152 @@ def _make_cache_key(times, targets):
     cache_key : tuple
         A hashable tuple for use as a cache key
     """
-    # make a tuple from times
-    try:
-        timekey = tuple(times.jd) + times.shape
-    except BaseException:        # must be scalar
-        timekey = (times.jd,)
-    # make hashable thing from targets coords
-    try:
-        if hasattr(targets, 'frame'):
-            # treat as a SkyCoord object. Accessing the longitude
-            # attribute of the frame data should be unique and is
-            # quicker than accessing the ra attribute.
-            targkey = tuple(targets.frame.data.lon.value.ravel()) + targets.shape
-        else:
-            # assume targets is a string.
-            targkey = (targets,)
-    except BaseException:
-        targkey = (targets.frame.data.lon,)
-    return timekey + targkey
+    return _make_time_key(times) + _make_target_key(targets)
+
+
+#: Largest difference between two times considered to be the same grid point
+#: when reusing alt/az results computed on a finer grid (1 ms).
+_SUB_GRID_TOLERANCE = 1e-3 * u.s
+
+
+def _make_atmosphere_key(observer, force_zero_pressure=False):
+    """
+    Make a hashable key for the atmosphere of ``observer``, which determines
+    the refraction of alt/az coordinates.
+
+    The key holds the values of the pressure, temperature and relative
+    humidity, rather than a flag, so that cached coordinates are not reused
+    after the atmosphere of the observer changes. Without an atmosphere, the
+    temperature and humidity do not matter and are left out.
+
+    Parameters
+    ----------
+    observer : `~astroplan.Observer`
+        The observer.
+    force_zero_pressure : bool (optional)
+        Forcefully use 0 pressure.
+
+    Returns
+    -------
+    key : tuple
+        Pressure in hPa, temperature in deg C and relative humidity
+    """
+    pressure = (0 if observer.pressure is None else
+                u.Quantity(observer.pressure, u.hPa).value)
+    if force_zero_pressure or pressure == 0:
+        return (0., None, None)
+
+    temperature = (None if observer.temperature is None else
+                   observer.temperature.to(u.deg_C, u.temperature()).value)
+    return (float(pressure), temperature, observer.relative_humidity)
+
+
+def _zero_pressure(force_zero_pressure):
+    """
+    Pressure argument of `~astroplan.Observer.altaz` for
+    ``force_zero_pressure``: zero, or `None` for the observer's pressure.
+    """
+    return 0*u.hPa if force_zero_pressure else None
+
+
+def _sub_grid_index(times, grid_times, tolerance=_SUB_GRID_TOLERANCE):
+    """
+    Find the indices of ``times`` within the sorted time grid ``grid_times``.
+
+    Parameters
+    ----------
+    times : `~astropy.time.Time`
+        One-dimensional array of times to look up.
+    grid_times : `~astropy.time.Time`
+        One-dimensional, strictly increasing array of times.
+    tolerance : `~astropy.units.Quantity` (optional)
+        Maximum difference between a time and the matching grid point, to
+        allow for rounding in the Julian dates of grids generated with
+        different spacings.
+
+    Returns
+    -------
+    index : slice, `~numpy.ndarray` or `None`
+        A slice if ``times`` is a regularly strided subset of ``grid_times``,
+        an integer index array if it is an irregular subset, and `None` if
+        any of ``times`` is not on the grid.
+    """
+    if (times.ndim != 1 or grid_times.ndim != 1 or len(times) == 0 or
+            len(times) > len(grid_times) or times.scale != grid_times.scale):
+        return None
+
+    grid_jd = grid_times.jd1 + grid_times.jd2
+    if np.any(np.diff(grid_jd) <= 0):
+        return None
+
+    # nearest grid point to each of the requested times
+    jd = times.jd1 + times.jd2
+    index = np.searchsorted(grid_jd, jd).clip(0, len(grid_jd) - 1)
+    previous = (index - 1).clip(0)
+    use_previous = abs(jd - grid_jd[previous]) < abs(jd - grid_jd[index])
+    index = np.where(use_previous, previous, index)
+
+    # compare the two-part Julian dates to avoid losing precision
+    delta = ((times.jd1 - grid_times.jd1[index]) +
+             (times.jd2 - grid_times.jd2[index]))
+    if np.any(np.abs(delta) > tolerance.to(u.day).value):
+        return None
+
+    steps = np.diff(index)
+    if len(index) == 1 or (steps[0] > 0 and np.all(steps == steps[0])):
+        step = steps[0] if len(index) > 1 else 1
+        return slice(index[0], index[-1] + 1, step)
+    return index
+
+
+def _get_altaz_from_sub_grid(times, observer, target_key, force_zero_pressure):
+    """
+    Reuse cached alt/az coordinates computed for the same targets on a grid
+    of times of which ``times`` is a subset.
+
+    Parameters
+    ----------
+    times : `~astropy.time.Time`
+        Array of times on which to test the constraint.
+    observer : `~astroplan.Observer`
+        The observer who has constraints ``constraints``.
+    target_key : tuple
+        Cache key of the targets, from `_make_target_key`.
+    force_zero_pressure : bool
+        Forcefully use 0 pressure.
+
+    Returns
+    -------
+    altaz_dict : dict or `None`
+        Dictionary like the one returned by `_get_altaz`, where the alt/az
+        coordinates are a slice of the cached ones, or `None` if no cached
+        result can be reused.
+    """
+    if times.ndim != 1:
+        return None
+
+    atmosphere_key = _make_atmosphere_key(observer, force_zero_pressure)
+    for key, cached_altaz in observer.cache.items():
+        if (key[0] != 'altaz' or key[1] != atmosphere_key or
+                key[3] != target_key):
+            continue
+
+        # the time axis must be the last axis of the cached coordinates,
+        # i.e. the targets are either scalar or gridded against the times,
+        # and not paired one-to-one with them
+        grid_times = cached_altaz['times']
+        altaz = cached_altaz['altaz']
+        target_shape = target_key[1] if len(target_key) > 1 else ()
+        if (grid_times.ndim != 1 or
+                altaz.shape[-1:] != grid_times.shape or
+                (target_shape != () and target_shape[-1:] != (1,))):
+            continue
+
+        index = _sub_grid_index(times, grid_times)
+        if index is not None:
+            return dict(times=times, altaz=altaz[..., index])
+
+    return None
 
 
 def _get_altaz(times, observer, targets, force_zero_pressure=False):
@@ -83,7 +278,11 @@ def _get_altaz(times, observer, targets, force_zero_pressure=False):
     the two times in ``time_range`` with grid spacing ``time_resolution``
     for ``observer``.
 
-    Cache the result on the ``observer`` object.
+    Cache the result in the ``observer``'s `~astroplan.ObserverCache`. If
+    the alt/az coordinates of the same ``targets`` have already been cached
+    on a grid of times that contains ``times`` (for instance a finer grid, or
+    a longer time range), the cached coordinates are sliced rather than
+    recomputed.
 
     Parameters
     ----------
@@ -103,34 +302,74 @@ def _get_altaz(times, observer, targets, force_zero_pressure=False):
         times for the alt/az computations, (2) 'altaz' contains the
         corresponding alt/az coordinates at those times.
     """
-    if not hasattr(observer, '_altaz_cache'):
-        observer._altaz_cache = {}
-
     # convert times, targets to tuple for hashing
-    aakey = _make_cache_key(times, targets)
+    target_key = _make_target_key(targets)
+    aakey = ('altaz', _make_atmosphere_key(observer, force_zero_pressure),
+             _make_time_key(times), target_key)
 
-    if aakey not in observer._altaz_cache:
-        try:
-            if force_zero_pressure:
-                observer_old_pressure = observer.pressure
-                observer.pressure = 0
+    cached_altaz = observer.cache.get(aakey)
+    if cached_altaz is None:
+        cached_altaz = _get_altaz_from_sub_grid(times, observer, target_key,
+                                                force_zero_pressure)
+    if cached_altaz is None:
+        altaz = observer.altaz(times, targets, grid_times_targets=False,
+                               pressure=_zero_pressure(force_zero_pressure))
+        cached_altaz = dict(times=times, altaz=altaz)
+        observer.cache.set(aakey, cached_altaz)
+
+    return cached_altaz
+
+
+def _get_local_sidereal_times(times, observer):
+    """
+    Calculate the apparent local sidereal times of ``observer`` at ``times``.
+
+    Cache the result in the ``observer``'s `~astroplan.ObserverCache`.
+
+    Parameters
+    ----------
+    times : `~astropy.time.Time`
+        Array of times.
+    observer : `~astroplan.Observer`
+        The observer.
 
-            altaz = observer.altaz(times, targets, grid_times_targets=False)
-            observer._altaz_cache[aakey] = dict(times=times,
-                                                altaz=altaz)
-        finally:
-            if force_zero_pressure:
-                observer.pressure = observer_old_pressure
+    Returns
+    -------
+    lst : `~astropy.coordinates.Longitude`
+        Apparent local sidereal times
+    """
+    aakey = ('lst',) + _make_cache_key(times, 'lst')
+
+    lst = observer.cache.get(aakey)
+    if lst is None:
+        lst = _from_ephemeris_cache(
+            observer, times, 'lst',
+            lambda: observer.local_sidereal_time(times),
+            lambda lst: lst.hourangle,
+            lambda array: Longitude(array, u.hourangle, copy=False))
+        observer.cache.set(aakey, lst)
 
-    return observer._altaz_cache[aakey]
+    return lst
 
 
-def _get_moon_data(times, observer, force_zero_pressure=False):
+def _get_altitude_trig(times, observer, targets):
     """
-    Calculate moon altitude az and illumination for an array of times for
-    ``observer``.
+    Calculate the altitude of ``targets`` at ``times`` with spherical
+    trigonometry, rather than with a full transformation to
+    `~astropy.coordinates.AltAz`.
+
+    The targets are transformed once to the apparent (precessed and
+    nutated) equator and equinox at the middle of the grid of times, and the
+    hour angles are computed from the apparent local sidereal time. If the
+    ``observer`` has a non-zero ``pressure``, atmospheric refraction is added
+    with the same model as `~astropy.coordinates.AltAz` (see
+    `~astroplan.Observer._refraction`).
+
+    Aberration and precession across the grid are not followed, so the
+    altitudes differ from those of `_get_altaz` by up to ~15 arcsec for
+    grids spanning a few days, growing by ~50 arcsec per year of grid span.
 
-    Cache the result on the ``observer`` object.
+    Cache the result in the ``observer``'s `~astroplan.ObserverCache`.
 
     Parameters
     ----------
@@ -138,39 +377,362 @@ def _get_moon_data(times, observer, force_zero_pressure=False):
         Array of times on which to test the constraint.
     observer : `~astroplan.Observer`
         The observer who has constraints ``constraints``.
-    force_zero_pressure : bool
-        Forcefully use 0 pressure.
+    targets : {list, `~astropy.coordinates.SkyCoord`, `~astroplan.FixedTarget`}
+        Target or list of targets.
 
     Returns
     -------
-    moon_dict : dict
-        Dictionary containing three key-value pairs. (1) 'times' contains the
-        times for the computations, (2) 'altaz' contains the
-        corresponding alt/az coordinates at those times and (3) contains
-        the moon illumination for those times.
+    altitude : `~astropy.units.Quantity`
+        Altitudes of ``targets`` at ``times``, broadcast against each other
     """
-    if not hasattr(observer, '_moon_cache'):
-        observer._moon_cache = {}
+    aakey = (('altitude_trig', _make_atmosphere_key(observer)) +
+             _make_cache_key(times, targets))
 
-    # convert times to tuple for hashing
-    aakey = _make_cache_key(times, 'moon')
+    altitude = observer.cache.get(aakey)
+    if altitude is None:
+        lst = _get_local_sidereal_times(times, observer)
+        mid_time = times if times.isscalar else times.ravel()[times.size // 2]
+        apparent_targets = get_skycoord(targets).transform_to(
+            PrecessedGeocentric(equinox=mid_time, obstime=mid_time))
+        altitude = observer._altitude_trig(lst, apparent_targets,
+                                           refraction=True).to(u.deg)
+        observer.cache.set(aakey, altitude)
 
-    if aakey not in observer._moon_cache:
-        try:
-            if force_zero_pressure:
-                observer_old_pressure = observer.pressure
-                observer.pressure = 0
+    return altitude
 
-            altaz = observer.moon_altaz(times)
-            illumination = np.array(moon_illumination(times))
-            observer._moon_cache[aakey] = dict(times=times,
-                                               illum=illumination,
-                                               altaz=altaz)
-        finally:
-            if force_zero_pressure:
-                observer.pressure = observer_old_pressure
 
-    return observer._moon_cache[aakey]
+def _unit_vectors(coordinates):
+    """
+    Cartesian unit vectors of ``coordinates``, with the components along the
+    last axis.
+    """
+    xyz = coordinates.represent_as(UnitSphericalRepresentation).to_cartesian()
+    return np.stack([xyz.x.value, xyz.y.value, xyz.z.value], axis=-1)
+
+
+def _get_target_unit_vectors(times, observer, targets):
+    """
+    Calculate the unit vectors of ``targets`` in the
+    `~astropy.coordinates.GCRS` frame at the middle of the grid of ``times``.
+
+    Cache the result in the ``observer``'s `~astroplan.ObserverCache`.
+
+    Parameters
+    ----------
+    times : `~astropy.time.Time`
+        Array of times on which to test the constraint.
+    observer : `~astroplan.Observer`
+        The observer who has constraints ``constraints``.
+    targets : {list, `~astropy.coordinates.SkyCoord`, `~astroplan.FixedTarget`}
+        Target or list of targets.
+
+    Returns
+    -------
+    unit_vectors : `~numpy.ndarray`
+        Array with the shape of ``targets`` and a last axis of length three
+    """
+    aakey = ('target_unit_vectors',) + _make_cache_key(times, targets)
+
+    unit_vectors = observer.cache.get(aakey)
+    if unit_vectors is None:
+        mid_time = times if times.isscalar else times.ravel()[times.size // 2]
+        unit_vectors = _unit_vectors(
+            get_skycoord(targets).transform_to(GCRS(obstime=mid_time)))
+        observer.cache.set(aakey, unit_vectors)
+
+    return unit_vectors
+
+
+def _separation_cosines(body_vectors, target_vectors):
+    """
+    Cosines of the angular separations between bodies along the grid of times
+    and targets, from their unit vectors.
+
+    The common case of targets gridded against a one-dimensional array of
+    times, with shapes ``(M, 1, 3)`` and ``(N, 3)``, is computed as an
+    ``(M, 3) x (3, N)`` matrix product. Other shapes are broadcast against
+    each other.
+    """
+    if body_vectors.ndim == 2 and target_vectors.shape[-2:-1] == (1,):
+        cosines = np.dot(target_vectors[..., 0, :], body_vectors.T)
+        return cosines.reshape(target_vectors.shape[:-2] +
+                               body_vectors.shape[:1])
+    return np.einsum('...i,...i->...', target_vectors, body_vectors)
+
+
+def _separation_mask(cos_separation, min, max, name):
+    """
+    Mask of the separations between ``min`` and ``max`` (inclusive), from
+    their cosines.
+    """
+    if min is None and max is not None:
+        mask = cos_separation >= np.cos(max)
+    elif max is None and min is not None:
+        mask = cos_separation <= np.cos(min)
+    elif min is not None and max is not None:
+        mask = ((cos_separation <= np.cos(min)) &
+                (cos_separation >= np.cos(max)))
+    else:
+        raise ValueError("No max and/or min specified in "
+                         "{}.".format(name))
+    return mask
+
+
+def _from_ephemeris_cache(observer, times, name, compute, to_array,
+                          from_array):
+    """
+    Read an ephemeris from the persistent ``ephemeris_cache`` of
+    ``observer``, or compute it and store it there.
+
+    Parameters
+    ----------
+    observer : `~astroplan.Observer`
+        The observer.
+    times : `~astropy.time.Time`
+        Grid of times of the ephemeris.
+    name : tuple or str
+        Name of the ephemeris, with any parameter it depends on.
+    compute : callable
+        Function without arguments that computes the ephemeris.
+    to_array : callable
+        Function that converts the ephemeris to a `~numpy.ndarray`.
+    from_array : callable
+        Function that converts an array from ``to_array`` back to the
+        ephemeris.
+
+    Returns
+    -------
+    value : object
+        The ephemeris
+    """
+    ephemeris_cache = observer.ephemeris_cache
+    if ephemeris_cache is None:
+        return compute()
+
+    array = ephemeris_cache.get(observer.location, times, name)
+    if array is not None:
+        return from_array(array)
+
+    value = compute()
+    ephemeris_cache.set(observer.location, times, name, to_array(value))
+    return value
+
+
+def _gcrs_to_array(coordinates):
+    """
+    Array of the Cartesian positions, in m, of ``coordinates`` in the
+    `~astropy.coordinates.GCRS` frame, followed by the position (in m) and
+    velocity (in m/s) of the observer.
+    """
+    xyz = coordinates.cartesian.xyz
+    return np.concatenate([
+        xyz.to(u.m).value,
+        _broadcast_xyz(coordinates.obsgeoloc, u.m, coordinates.shape),
+        _broadcast_xyz(coordinates.obsgeovel, u.m/u.s, coordinates.shape)])
+
+
+def _broadcast_xyz(representation, unit, shape):
+    """
+    Cartesian components of ``representation`` in ``unit``, of shape
+    ``(3,) + shape``, e.g. for the position of the observer, which is a
+    scalar for the coordinates of `~astropy.coordinates.get_sun`.
+    """
+    values = representation.xyz.to(unit).value
+    # align the dimensions of the representation with the trailing ones of
+    # ``shape``, after the axis of the components
+    values = values.reshape((3,) + (1,) * (len(shape) -
+                                           len(representation.shape)) +
+                            representation.shape)
+    return np.broadcast_to(values, (3,) + shape)
+
+
+def _gcrs_from_array(array, times):
+    """
+    Coordinates in the `~astropy.coordinates.GCRS` frame at ``times`` from
+    an array made by `_gcrs_to_array`.
+    """
+    return SkyCoord(GCRS(
+        CartesianRepresentation(u.Quantity(array[0:3], u.m, copy=False)),
+        obstime=times,
+        obsgeoloc=CartesianRepresentation(
+            u.Quantity(array[3:6], u.m, copy=False)),
+        obsgeovel=CartesianRepresentation(
+            u.Quantity(array[6:9], u.m/u.s, copy=False))),
+        representation_type='spherical')
+
+
+class EphemerisGrid(object):
+    """
+    Positions of the Sun and Moon, and related quantities, on a grid of
+    times for an `~astroplan.Observer`.
+
+    Every constraint that depends on the Sun, the Moon or the sidereal time
+    reads it from an ``EphemerisGrid``, so that the solar system ephemerides
+    are evaluated only once per grid of times, however many constraints use
+    them. Each quantity is computed on first access and stored in the
+    ``observer``'s `~astroplan.ObserverCache`, where it is shared by all
+    ``EphemerisGrid`` instances for the same times, observer and ephemeris.
+    If the observer has an ``ephemeris_cache``, the quantities are also
+    stored on disk, and read back from there by later processes.
+
+    Examples
+    --------
+    >>> from astroplan import Observer
+    >>> from astroplan.constraints import EphemerisGrid
+    >>> from astropy.time import Time
+    >>> import astropy.units as u
+    >>> subaru = Observer.at_site("Subaru")
+    >>> times = Time("2016-03-28 12:00") + [0, 1, 2]*u.hour
+    >>> grid = EphemerisGrid(times, subaru)
+    >>> grid.moon_illumination # doctest: +SKIP
+    array([0.73307187, 0.72850539, 0.72391146])
+    """
+
+    def __init__(self, times, observer, ephemeris=None):
+        """
+        Parameters
+        ----------
+        times : `~astropy.time.Time`
+            Array of times.
+        observer : `~astroplan.Observer`
+            The observer.
+        ephemeris : str, optional
+            Ephemeris to use for the Moon.  If not given, use the one set with
+            `~astropy.coordinates.solar_system_ephemeris` (which is
+            set to 'builtin' by default).
+        """
+        self.times = times
+        self.observer = observer
+        self.ephemeris = ephemeris
+        self._time_key = _make_time_key(times)
+
+    def _cached(self, name, compute, to_array=None, from_array=None):
+        # the default ephemeris is the one set at run time, so that the
+        # cached positions of different ephemerides are kept apart
+        ephemeris = self.ephemeris
+        if ephemeris is None:
+            ephemeris = solar_system_ephemeris.get()
+        key = ('ephemeris', name, ephemeris, self._time_key)
+        value = self.observer.cache.get(key)
+        if value is None:
+            if to_array is None:
+                value = compute()
+            else:
+                value = _from_ephemeris_cache(
+                    self.observer, self.times, (name, ephemeris),
+                    compute, to_array, from_array)
+            self.observer.cache.set(key, value)
+        return value
+
+    def _cached_altaz(self, name, body, force_zero_pressure):
+        pressure = _zero_pressure(force_zero_pressure)
+
+        def from_array(array):
+            frame = self.observer.altaz(self.times, pressure=pressure)
+            return SkyCoord(frame.realize_frame(CartesianRepresentation(
+                u.Quantity(array, u.m, copy=False))),
+                representation_type='spherical')
+
+        return self._cached(
+            (name, _make_atmosphere_key(self.observer, force_zero_pressure)),
+            lambda: self.observer.altaz(self.times, body(),
+                                        pressure=pressure),
+            lambda altaz: altaz.cartesian.xyz.to(u.m).value, from_array)
+
+    @property
+    def sun(self):
+        """
+        Geocentric position of the Sun, in the `~astropy.coordinates.GCRS`
+        frame.
+
+        The solar parallax is below 9 arcsec, which does not justify the
+        much more expensive computation of an observer centred position.
+        """
+        return self._cached('sun', lambda: get_sun(self.times),
+                            _gcrs_to_array,
+                            lambda array: _gcrs_from_array(array, self.times))
+
+    @property
+    def moon(self):
+        """
+        Position of the Moon as seen by the observer, in the
+        `~astropy.coordinates.GCRS` frame.
+        """
+        return self._cached('moon', lambda: get_moon(
+            self.times, location=self.observer.location,
+            ephemeris=self.ephemeris),
+            _gcrs_to_array,
+            lambda array: _gcrs_from_array(array, self.times))
+
+    @property
+    def sun_unit_vectors(self):
+        """
+        Cartesian unit vectors of the direction of the Sun in the
+        `~astropy.coordinates.GCRS` frame, with the components along the
+        last axis.
+        """
+        return self._cached('sun_unit_vectors',
+                            lambda: _unit_vectors(self.sun))
+
+    @property
+    def moon_unit_vectors(self):
+        """
+        Cartesian unit vectors of the direction of the Moon, as seen by the
+        observer, in the `~astropy.coordinates.GCRS` frame, with the
+        components along the last axis.
+        """
+        return self._cached('moon_unit_vectors',
+                            lambda: _unit_vectors(self.moon))
+
+    @property
+    def local_sidereal_time(self):
+        """
+        Apparent local sidereal times of the observer.
+        """
+        return _get_local_sidereal_times(self.times, self.observer)
+
+    @property
+    def moon_illumination(self):
+        """
+        Fraction of the Moon illuminated.
+        """
+        return self._cached('moon_illumination', lambda: np.array(
+            _moon_illumination_from_coords(self.sun, self.moon)),
+            np.asarray, np.asarray)
+
+    def sun_altaz(self, force_zero_pressure=False):
+        """
+        Alt/az coordinates of the Sun.
+
+        Parameters
+        ----------
+        force_zero_pressure : bool (optional)
+            Forcefully use 0 pressure, which ignores atmospheric refraction.
+
+        Returns
+        -------
+        altaz : `~astropy.coordinates.SkyCoord`
+            Position of the Sun in the `~astropy.coordinates.AltAz` frame
+        """
+        return self._cached_altaz('sun_altaz', lambda: self.sun,
+                                  force_zero_pressure)
+
+    def moon_altaz(self, force_zero_pressure=False):
+        """
+        Alt/az coordinates of the Moon.
+
+        Parameters
+        ----------
+        force_zero_pressure : bool (optional)
+            Forcefully use 0 pressure, which ignores atmospheric refraction.
+
+        Returns
+        -------
+        altaz : `~astropy.coordinates.SkyCoord`
+            Position of the Moon in the `~astropy.coordinates.AltAz` frame
+        """
+        return self._cached_altaz('moon_altaz', lambda: self.moon,
+                                  force_zero_pressure)
 
 
 def _get_meridian_transit_times(times, observer, targets):
@@ -178,7 +740,7 @@ def _get_meridian_transit_times(times, observer, targets):
     Calculate next meridian transit for an array of times for ``targets`` and
     ``observer``.
 
-    Cache the result on the ``observer`` object.
+    Cache the result in the ``observer``'s `~astroplan.ObserverCache`.
 
     Parameters
     ----------
@@ -195,29 +757,122 @@ def _get_meridian_transit_times(times, observer, targets):
         Dictionary containing a key-value pair. 'times' contains the
         meridian_transit times.
     """
-    if not hasattr(observer, '_meridian_transit_cache'):
-        observer._meridian_transit_cache = {}
-
     # convert times to tuple for hashing
-    aakey = _make_cache_key(times, targets)
+    aakey = ('meridian_transit',) + _make_cache_key(times, targets)
 
-    if aakey not in observer._meridian_transit_cache:
+    cached_transits = observer.cache.get(aakey)
+    if cached_transits is None:
         meridian_transit_times = observer.target_meridian_transit_time(times, targets)
-        observer._meridian_transit_cache[aakey] = dict(times=meridian_transit_times)
+        cached_transits = dict(times=meridian_transit_times)
+        observer.cache.set(aakey, cached_transits)
+
+    return cached_transits
+
 
-    return observer._meridian_transit_cache[aakey]
+def _microseconds_of_day(time):
+    """
+    Time of day in integer microseconds.
+
+    Parameters
+    ----------
+    time : `~datetime.time` or `~astropy.time.Time`
+        Time of day, or times whose time of day is computed in their own time
+        scale, rounded to microseconds like `~astropy.time.Time.datetime`.
+
+    Returns
+    -------
+    microseconds : int or `~numpy.ndarray`
+        Microseconds since midnight
+    """
+    if isinstance(time, datetime.time):
+        return (((time.hour * 60 + time.minute) * 60 + time.second) * 10**6 +
+                time.microsecond)
+
+    ihmsf = erfa.d2dtf(time.scale.upper().encode('ascii'), 6,
+                       time.jd1, time.jd2)[3]
+    if ihmsf.dtype.names:
+        hours, minutes, seconds, fractions = (ihmsf[name] for name in 'hmsf')
+    else:
+        hours, minutes, seconds, fractions = np.moveaxis(ihmsf, -1, 0)
+    return (((hours.astype(np.int64) * 60 + minutes) * 60 + seconds) *
+            10**6 + fractions)
 
 
 @abstractmethod
 class Constraint(object):
     """
     Abstract class for objects defining observational constraints.
+
+    Constraints can be combined with the ``&`` (and), ``|`` (or) and ``~``
+    (not) operators into a boolean compound constraint. Identical
+    constraints in a compound constraint, or shared between several compound
+    constraints, are evaluated only once per observer, times and targets.
+
+    Examples
+    --------
+    >>> from astroplan import (AltitudeConstraint, AtNightConstraint,
+    ...                        MoonSeparationConstraint)
+    >>> import astropy.units as u
+    >>> constraint = (AltitudeConstraint(min=30*u.deg) &
+    ...               (AtNightConstraint.twilight_astronomical() |
+    ...                ~MoonSeparationConstraint(max=30*u.deg)))
     """
     __metaclass__ = ABCMeta
 
+    # Relative cost of evaluating the constraint, used to evaluate the
+    # cheapest constraints first when several are combined (see
+    # `_evaluate_constraints`). Constraints that only depend on the times
+    # are cheapest, followed by those using the shared `EphemerisGrid`, and
+    # those that transform the coordinates of every target.
+    _cost = 5
+
+    # Whether the results depend on the times and on the targets. Constraints
+    # that do not depend on the targets are computed once per grid of times,
+    # and constraints that do not depend on the times once per set of
+    # targets. These results are cached, and only broadcast to the shape of
+    # the full grid of targets and times when they are combined.
+    depends_on_time = True
+    depends_on_targets = True
+
+    def __and__(self, other):
+        return _AndConstraint([self, other])
+
+    def __or__(self, other):
+        return _OrConstraint([self, other])
+
+    def __invert__(self):
+        return _NotConstraint(self)
+
+    def _fingerprint(self):
+        params = []
+        for name, value in sorted(vars(self).items()):
+            params.extend([name, value])
+        try:
+            digest = _digest(*params)
+        except _UndigestibleError:
+            return None
+        return (self.__class__.__module__, self.__class__.__name__, digest)
+
+    @property
+    def fingerprint(self):
+        """
+        Hashable summary of the class and parameters of the constraint.
+
+        Constraints with equal fingerprints give equal results, so separate
+        but identical constraint instances, e.g. on different observing
+        blocks, share their memoised results in the observer's
+        `~astroplan.ObserverCache`.
+
+        The fingerprint is `None`, and the results are not memoised, if a
+        parameter cannot be summarised, i.e. an object with a custom `repr`
+        other than numbers, strings, units, dates, times, arrays and
+        coordinates.
+        """
+        return self._fingerprint()
+
     def __call__(self, observer, targets, times=None,
                  time_range=None, time_grid_resolution=0.5*u.hour,
-                 grid_times_targets=False):
+                 grid_times_targets=False, packed=False):
         """
         Compute the constraint for this class
 
@@ -238,6 +893,9 @@ class Constraint(object):
             if True, grids the constraint result with targets along the first
             index and times along the second. Otherwise, we rely on broadcasting
             the shapes together using standard numpy rules.
+        packed : bool
+            if True, pack the boolean result into bits along the last (times)
+            axis with `~numpy.packbits`, which takes eight times less memory.
         Returns
         -------
         constraint_result : 1D or 2D array of float or bool
@@ -261,7 +919,8 @@ class Constraint(object):
             else:
                 targets = targets[..., np.newaxis]
         times, targets = observer._preprocess_inputs(times, targets, grid_times_targets=False)
-        result = self.compute_constraint(times, observer, targets)
+        result = shared_result = _compute_constraint(self, times, observer,
+                                                     targets)
 
         # make sure the output has the same shape as would result from
         # broadcasting times and targets against each other
@@ -278,6 +937,19 @@ class Constraint(object):
             if output_shape != np.array(result).shape:
                 result = np.broadcast_to(result, output_shape)
 
+        # memoised results are shared and read-only, so return a writable
+        # copy unless the result is broadcast, which is read-only anyway
+        if (result is shared_result and isinstance(result, np.ndarray) and
+                not result.flags.writeable and not packed):
+            result = result.copy()
+
+        if packed:
+            result = np.asarray(result)
+            if result.dtype != bool:
+                raise ValueError("Only boolean constraint results can be "
+                                 "packed into bits.")
+            result = np.packbits(result, axis=-1)
+
         return result
 
     @abstractmethod
@@ -305,6 +977,243 @@ class Constraint(object):
         raise NotImplementedError
 
 
+def _compute_constraint(constraint, times, observer, targets):
+    """
+    Compute ``constraint``, without broadcasting the result to the shape of
+    ``times`` and ``targets``.
+
+    The results are memoised through `_compute_shared`.
+    """
+    return _compute_shared(constraint, times, observer, targets)
+
+
+def _make_observer_key(observer):
+    """
+    Make a hashable key for the attributes of ``observer`` which constraints
+    depend on: its location, timezone and atmosphere.
+    """
+    return ((observer.location.x.value, observer.location.y.value,
+             observer.location.z.value), str(observer.timezone),
+            _make_atmosphere_key(observer))
+
+
+def _compute_shared(constraint, times, observer, targets):
+    """
+    Compute ``constraint`` through the ``observer``'s
+    `~astroplan.ObserverCache`, so that the results of identical
+    constraints are shared between compound constraints, and between the
+    observing blocks of schedulers.
+
+    The cached results are keyed on the fingerprint of the constraint, the
+    observer, and the ``times`` and ``targets`` only if the constraint
+    depends on them. Constraints which do not depend on the targets are
+    computed with ``targets=None``, and constraints without a fingerprint
+    are not memoised.
+    """
+    if isinstance(constraint, _CompoundConstraint):
+        return constraint.compute_constraint(times, observer, targets)
+
+    # constraints without a fingerprint are computed without memoisation
+    fingerprint = constraint.fingerprint
+    if not constraint.depends_on_targets:
+        targets = None
+    key = None
+    if fingerprint is not None:
+        key = ('constraint', fingerprint, _make_observer_key(observer))
+        if constraint.depends_on_time:
+            key += (_make_time_key(times),)
+        if targets is not None:
+            key += (_make_target_key(targets),)
+
+    result = None if key is None else observer.cache.get(key)
+    if _profilers and key is not None:
+        _record(constraint.__class__.__name__, hit=result is not None)
+
+    if result is None:
+        start = default_timer()
+        result = constraint.compute_constraint(times, observer, targets)
+        if _profilers:
+            _record(constraint.__class__.__name__, default_timer() - start,
+                    _size(result))
+        if key is not None:
+            if isinstance(result, np.ndarray):
+                # the result is shared, so protect it from modifications
+                result.flags.writeable = False
+            observer.cache.set(key, result)
+
+    return result
+
+
+class _CompoundConstraint(Constraint):
+    """
+    Abstract class for the combination of constraints with the ``&``, ``|``
+    and ``~`` operators.
+
+    Compound constraints are boolean: the results of constraints with
+    ``boolean_constraint=False`` are true where they are non-zero.
+    """
+
+    def __init__(self, constraints):
+        # flatten nested operations of the same kind, and drop duplicates
+        self.constraints = []
+        fingerprints = set()
+        for constraint in constraints:
+            children = (constraint.constraints
+                        if type(constraint) is type(self) else [constraint])
+            for child in children:
+                fingerprint = child._fingerprint()
+                if fingerprint is None:
+                    self.constraints.append(child)
+                elif fingerprint not in fingerprints:
+                    fingerprints.add(fingerprint)
+                    self.constraints.append(child)
+        self._cost = max(constraint._cost for constraint in self.constraints)
+        self.depends_on_time = any(constraint.depends_on_time
+                                   for constraint in self.constraints)
+        self.depends_on_targets = any(constraint.depends_on_targets
+                                      for constraint in self.constraints)
+
+    def __repr__(self):
+        return "<{}: {}>".format(self.__class__.__name__, self.constraints)
+
+    def _fingerprint(self):
+        fingerprints = [constraint._fingerprint()
+                        for constraint in self.constraints]
+        if None in fingerprints:
+            return None
+        return (self.__class__.__name__,) + tuple(sorted(fingerprints))
+
+
+class _AndConstraint(_CompoundConstraint):
+    """
+    Constraint satisfied where all of ``constraints`` are satisfied.
+    """
+
+    def compute_constraint(self, times, observer, targets):
+        mask = None
+        for constraint in sorted(self.constraints, key=lambda c: c._cost):
+            applied = _compute_shared(constraint, times, observer, targets)
+            mask = (np.array(applied, dtype=bool) if mask is None else
+                    np.logical_and(mask, applied))
+            if not np.any(mask):
+                break
+        return mask
+
+
+class _OrConstraint(_CompoundConstraint):
+    """
+    Constraint satisfied where any of ``constraints`` is satisfied.
+    """
+
+    def compute_constraint(self, times, observer, targets):
+        mask = None
+        for constraint in sorted(self.constraints, key=lambda c: c._cost):
+            applied = _compute_shared(constraint, times, observer, targets)
+            mask = (np.array(applied, dtype=bool) if mask is None else
+                    np.logical_or(mask, applied))
+            if np.all(mask):
+                break
+        return mask
+
+
+class _NotConstraint(_CompoundConstraint):
+    """
+    Constraint satisfied where ``constraint`` is not satisfied.
+    """
+
+    def __init__(self, constraint):
+        self.constraints = [constraint]
+        self._cost = constraint._cost
+        self.depends_on_time = constraint.depends_on_time
+        self.depends_on_targets = constraint.depends_on_targets
+
+    def compute_constraint(self, times, observer, targets):
+        applied = _compute_shared(self.constraints[0], times, observer,
+                                  targets)
+        return np.logical_not(applied)
+
+
+# Margin on the altitude limits of the declination pre-filter, which covers
+# refraction, aberration, and the precession and nutation of the declination
+_PREFILTER_MARGIN = 1*u.deg
+
+# Frames of coordinates fixed on the sky, whose declination does not change
+# significantly over a day
+_FIXED_FRAMES = ('icrs', 'fk5', 'fk4', 'fk4noeterms', 'galactic')
+
+
+def _daily_altitude_range(observer, targets):
+    """
+    Lowest and highest altitudes of fixed ``targets`` over a sidereal day,
+    from their declination and the latitude of ``observer``.
+
+    Parameters
+    ----------
+    observer : `~astroplan.Observer`
+        The observer.
+    targets : `~astropy.coordinates.SkyCoord`
+        The targets.
+
+    Returns
+    -------
+    altitude_range : tuple of `~astropy.units.Quantity` or `None`
+        The altitudes at lower and upper culmination, or `None` if the
+        targets are not fixed on the sky, i.e. not in one of the frames of
+        ``_FIXED_FRAMES`` or closer than 1 pc.
+    """
+    if targets.frame.name not in _FIXED_FRAMES:
+        return None
+
+    data = targets.data
+    if not isinstance(data, UnitSphericalRepresentation):
+        distance = getattr(data, 'distance', None)
+        if (distance is None or distance.unit.physical_type != 'length' or
+                np.any(distance < 1*u.pc)):
+            return None
+
+    dec = targets.icrs.dec
+    lat = observer.location.lat
+    return np.abs(lat + dec) - 90*u.deg, 90*u.deg - np.abs(lat - dec)
+
+
+def _prefilter_altitudes(times, observer, targets, min_altitude,
+                         max_altitude, compute):
+    """
+    Evaluate a boolean constraint on the altitude of ``targets``, which is
+    met between ``min_altitude`` and ``max_altitude``, only for the targets
+    whose result cannot be decided from their declination.
+
+    Fixed targets which never rise above ``min_altitude`` (or always stay
+    above ``max_altitude``) never meet the constraint, and targets which stay
+    between the limits all day always meet it. The constraint is computed
+    with ``compute(times, observer, targets)`` for the other targets only.
+
+    The pre-filter applies to targets gridded against a one-dimensional
+    array of times, i.e. with shape ``(N, 1)``; otherwise the constraint is
+    computed for all the targets.
+    """
+    if (times.ndim != 1 or targets.ndim != 2 or targets.shape[1] != 1):
+        return compute(times, observer, targets)
+
+    altitude_range = _daily_altitude_range(observer, targets)
+    if altitude_range is None:
+        return compute(times, observer, targets)
+
+    lowest, highest = altitude_range
+    never = ((highest < min_altitude - _PREFILTER_MARGIN) |
+             (lowest > max_altitude + _PREFILTER_MARGIN))
+    always = ((lowest > min_altitude + _PREFILTER_MARGIN) &
+              (highest < max_altitude - _PREFILTER_MARGIN))
+    undecided = ~(never | always)[:, 0]
+    if np.all(undecided):
+        return compute(times, observer, targets)
+
+    result = np.repeat(always, len(times), axis=1)
+    if np.any(undecided):
+        result[undecided] = compute(times, observer, targets[undecided])
+    return result
+
+
 class AltitudeConstraint(Constraint):
     """
     Constrain the altitude of the target.
@@ -324,9 +1233,19 @@ class AltitudeConstraint(Constraint):
         If True, the constraint is treated as a boolean (True for within the
         limits and False for outside).  If False, the constraint returns a
         float on [0, 1], where 0 is the min altitude and 1 is the max.
+    fast : bool (optional)
+        If True, compute the altitudes from the hour angles of the targets
+        with spherical trigonometry instead of transforming them to
+        `~astropy.coordinates.AltAz` at every time. This is several times
+        faster for large grids, and agrees with the full transformation to
+        within ~15 arcsec for grids spanning a few days (plus ~50 arcsec per
+        year of grid span), including atmospheric refraction when the
+        observer has a non-zero ``pressure``. Defaults to False.
     """
+    _cost = 4
 
-    def __init__(self, min=None, max=None, boolean_constraint=True):
+    def __init__(self, min=None, max=None, boolean_constraint=True,
+                 fast=False):
         if min is None:
             self.min = -90*u.deg
         else:
@@ -337,18 +1256,36 @@ class AltitudeConstraint(Constraint):
             self.max = max
 
         self.boolean_constraint = boolean_constraint
+        self.fast = fast
+
+    def _get_altitudes(self, times, observer, targets):
+        if self.fast:
+            return _get_altitude_trig(times, observer, targets)
+        return _get_altaz(times, observer, targets)['altaz'].alt
+
+    def _altitude_mask(self, times, observer, targets):
+        alt = self._get_altitudes(times, observer, targets)
+        lowermask = self.min <= alt
+        uppermask = alt <= self.max
+        return lowermask & uppermask
 
     def compute_constraint(self, times, observer, targets):
-        cached_altaz = _get_altaz(times, observer, targets)
-        alt = cached_altaz['altaz'].alt
         if self.boolean_constraint:
-            lowermask = self.min <= alt
-            uppermask = alt <= self.max
-            return lowermask & uppermask
+            return _prefilter_altitudes(times, observer, targets, self.min,
+                                        self.max, self._altitude_mask)
         else:
+            alt = self._get_altitudes(times, observer, targets)
             return max_best_rescale(alt, self.min, self.max)
 
 
+def _airmass_altitude(airmass):
+    """
+    Altitude at which the secant of the zenith angle is ``airmass``, which
+    can be a float or a dimensionless `~astropy.units.Quantity`.
+    """
+    return u.Quantity(np.arcsin(1 / u.Quantity(airmass, u.one).value), u.rad)
+
+
 class AirmassConstraint(AltitudeConstraint):
     """
     Constrain the airmass of a target.
@@ -369,6 +1306,9 @@ class AirmassConstraint(AltitudeConstraint):
     min : float or `None`
         Minimum airmass of the target. `None` indicates no limit.
     boolean_contstraint : bool
+    fast : bool (optional)
+        If True, compute the airmass from altitudes computed with spherical
+        trigonometry, see `AltitudeConstraint`. Defaults to False.
 
     Examples
     --------
@@ -378,14 +1318,31 @@ class AirmassConstraint(AltitudeConstraint):
         AirmassConstraint(2)
     """
 
-    def __init__(self, max=None, min=1, boolean_constraint=True):
+    def __init__(self, max=None, min=1, boolean_constraint=True, fast=False):
         self.min = min
         self.max = max
         self.boolean_constraint = boolean_constraint
+        self.fast = fast
 
     def compute_constraint(self, times, observer, targets):
-        cached_altaz = _get_altaz(times, observer, targets)
-        secz = cached_altaz['altaz'].secz.value
+        if (self.boolean_constraint and self.min is not None and
+                self.min >= 1):
+            # airmasses of at least 1 are only reached above the horizon
+            min_altitude = (0*u.deg if self.max is None else
+                            _airmass_altitude(self.max))
+            max_altitude = _airmass_altitude(self.min)
+            return _prefilter_altitudes(times, observer, targets,
+                                        min_altitude, max_altitude,
+                                        self._airmass_result)
+        return self._airmass_result(times, observer, targets)
+
+    def _airmass_result(self, times, observer, targets):
+        if self.fast:
+            secz = 1 / np.sin(self._get_altitudes(times, observer, targets))
+            secz = secz.value
+        else:
+            cached_altaz = _get_altaz(times, observer, targets)
+            secz = cached_altaz['altaz'].secz.value
         if self.boolean_constraint:
             if self.min is None and self.max is not None:
                 mask = secz <= self.max
@@ -404,14 +1361,18 @@ class AirmassConstraint(AltitudeConstraint):
                 mx = self.max
 
             mi = 1 if self.min is None else self.min
-            # values below 1 should be disregarded
-            return min_best_rescale(secz, mi, mx, less_than_min=0)
+            # values below 1 should be disregarded; ``secz`` is a new array,
+            # so it can be rescaled in place
+            return min_best_rescale(secz, mi, mx, less_than_min=0, out=secz)
 
 
 class AtNightConstraint(Constraint):
     """
     Constrain the Sun to be below ``horizon``.
     """
+    _cost = 2
+    depends_on_targets = False
+
     @u.quantity_input(horizon=u.deg)
     def __init__(self, max_solar_altitude=0*u.deg, force_pressure_zero=True):
         """
@@ -451,30 +1412,9 @@ class AtNightConstraint(Constraint):
         return cls(max_solar_altitude=-18*u.deg, **kwargs)
 
     def _get_solar_altitudes(self, times, observer, targets):
-        if not hasattr(observer, '_altaz_cache'):
-            observer._altaz_cache = {}
-
-        aakey = _make_cache_key(times, 'sun')
-
-        if aakey not in observer._altaz_cache:
-            try:
-                if self.force_pressure_zero:
-                    observer_old_pressure = observer.pressure
-                    observer.pressure = 0
-
-                # find solar altitude at these times
-                altaz = observer.altaz(times, get_sun(times))
-                altitude = altaz.alt
-                # cache the altitude
-                observer._altaz_cache[aakey] = dict(times=times,
-                                                    altitude=altitude)
-            finally:
-                if self.force_pressure_zero:
-                    observer.pressure = observer_old_pressure
-        else:
-            altitude = observer._altaz_cache[aakey]['altitude']
-
-        return altitude
+        sun_altaz = EphemerisGrid(times, observer).sun_altaz(
+            force_zero_pressure=self.force_pressure_zero)
+        return sun_altaz.alt
 
     def compute_constraint(self, times, observer, targets):
         solar_altitude = self._get_solar_altitudes(times, observer, targets)
@@ -486,6 +1426,8 @@ class GalacticLatitudeConstraint(Constraint):
     """
     Constrain the distance between the Galactic plane and some targets.
     """
+    _cost = 1
+    depends_on_time = False
 
     def __init__(self, min=None, max=None):
         """
@@ -519,7 +1461,15 @@ class GalacticLatitudeConstraint(Constraint):
 class SunSeparationConstraint(Constraint):
     """
     Constrain the distance between the Sun and some targets.
+
+    The separations are computed from the dot products of unit vectors,
+    with the targets transformed once to the `~astropy.coordinates.GCRS`
+    frame at the middle of the grid of times. They agree with
+    `~astropy.coordinates.SkyCoord.separation` to better than 1 arcsec for
+    grids spanning a day, and to ~40 arcsec for grids spanning a year, as
+    the annual aberration of the targets changes.
     """
+    _cost = 3
 
     def __init__(self, min=None, max=None):
         """
@@ -536,31 +1486,21 @@ class SunSeparationConstraint(Constraint):
         self.max = max
 
     def compute_constraint(self, times, observer, targets):
-        # use get_body rather than get sun here, since
-        # it returns the Sun's coordinates in an observer
-        # centred frame, so the separation is as-seen
-        # by the observer.
-        # 'get_sun' returns ICRS coords.
-        sun = get_body('sun', times, location=observer.location)
-        solar_separation = sun.separation(targets)
-
-        if self.min is None and self.max is not None:
-            mask = self.max >= solar_separation
-        elif self.max is None and self.min is not None:
-            mask = self.min <= solar_separation
-        elif self.min is not None and self.max is not None:
-            mask = ((self.min <= solar_separation) &
-                    (solar_separation <= self.max))
-        else:
-            raise ValueError("No max and/or min specified in "
-                             "SunSeparationConstraint.")
-        return mask
+        sun_vectors = EphemerisGrid(times, observer).sun_unit_vectors
+        target_vectors = _get_target_unit_vectors(times, observer, targets)
+        return _separation_mask(_separation_cosines(sun_vectors,
+                                                    target_vectors),
+                                self.min, self.max, "SunSeparationConstraint")
 
 
 class MoonSeparationConstraint(Constraint):
     """
     Constrain the distance between the Earth's moon and some targets.
+
+    The separations are computed as in `SunSeparationConstraint`, from the
+    position of the Moon as seen by the observer.
     """
+    _cost = 3
 
     def __init__(self, min=None, max=None, ephemeris=None):
         """
@@ -582,28 +1522,11 @@ class MoonSeparationConstraint(Constraint):
         self.ephemeris = ephemeris
 
     def compute_constraint(self, times, observer, targets):
-        # removed the location argument here, which causes small <1 deg
-        # innacuracies, but it is needed until astropy PR #5897 is released
-        # which should be astropy 1.3.2
-        moon = get_moon(times,
-                        ephemeris=self.ephemeris)
-        # note to future editors - the order matters here
-        # moon.separation(targets) is NOT the same as targets.separation(moon)
-        # the former calculates the separation in the frame of the moon coord
-        # which is GCRS, and that is what we want.
-        moon_separation = moon.separation(targets)
-
-        if self.min is None and self.max is not None:
-            mask = self.max >= moon_separation
-        elif self.max is None and self.min is not None:
-            mask = self.min <= moon_separation
-        elif self.min is not None and self.max is not None:
-            mask = ((self.min <= moon_separation) &
-                    (moon_separation <= self.max))
-        else:
-            raise ValueError("No max and/or min specified in "
-                             "MoonSeparationConstraint.")
-        return mask
+        ephemerides = EphemerisGrid(times, observer, ephemeris=self.ephemeris)
+        target_vectors = _get_target_unit_vectors(times, observer, targets)
+        return _separation_mask(_separation_cosines(
+            ephemerides.moon_unit_vectors, target_vectors),
+            self.min, self.max, "MoonSeparationConstraint")
 
 
 class MoonIlluminationConstraint(Constraint):
@@ -612,6 +1535,8 @@ class MoonIlluminationConstraint(Constraint):
 
     Constraint is also satisfied if the Moon has set.
     """
+    _cost = 2
+    depends_on_targets = False
 
     def __init__(self, min=None, max=None, ephemeris=None):
         """
@@ -685,12 +1610,12 @@ class MoonIlluminationConstraint(Constraint):
 
     def compute_constraint(self, times, observer, targets):
         # first is the moon up?
-        cached_moon = _get_moon_data(times, observer)
-        moon_alt = cached_moon['altaz'].alt
+        ephemerides = EphemerisGrid(times, observer, ephemeris=self.ephemeris)
+        moon_alt = ephemerides.moon_altaz().alt
         moon_down_mask = moon_alt < 0
         moon_up_mask = moon_alt >= 0
 
-        illumination = cached_moon['illum']
+        illumination = ephemerides.moon_illumination
         if self.min is None and self.max is not None:
             mask = (self.max >= illumination) | moon_down_mask
         elif self.max is None and self.min is not None:
@@ -708,7 +1633,13 @@ class MoonIlluminationConstraint(Constraint):
 class LocalTimeConstraint(Constraint):
     """
     Constrain the observable hours.
+
+    The limits are compared with the times of day in the time scale of the
+    times, i.e. in UTC for UTC times. Any ``tzinfo`` of the limits is
+    ignored.
     """
+    _cost = 0
+    depends_on_targets = False
 
     def __init__(self, min=None, max=None):
         """
@@ -749,44 +1680,30 @@ class LocalTimeConstraint(Constraint):
 
     def compute_constraint(self, times, observer, targets):
 
-        timezone = None
-
-        # get timezone from time objects, or from observer
         if self.min is not None:
-            timezone = self.min.tzinfo
-
-        elif self.max is not None:
-            timezone = self.max.tzinfo
-
-        if timezone is None:
-            timezone = observer.timezone
-
-        if self.min is not None:
-            min_time = self.min
+            min_time = _microseconds_of_day(self.min)
         else:
-            min_time = self.min = datetime.time(0, 0, 0)
+            min_time = 0
 
         if self.max is not None:
-            max_time = self.max
+            max_time = _microseconds_of_day(self.max)
         else:
-            max_time = datetime.time(23, 59, 59)
+            max_time = _microseconds_of_day(datetime.time(23, 59, 59))
+
+        # times of day, with the same rounding to microseconds as
+        # `~astropy.time.Time.datetime`
+        time_of_day = _microseconds_of_day(times)
 
         # If time limits occur on same day:
         if min_time < max_time:
-            try:
-                mask = np.array([min_time <= t.time() <= max_time for t in times.datetime])
-            except BaseException:                # use np.bool so shape queries don't cause problems
-                mask = np.bool_(min_time <= times.datetime.time() <= max_time)
+            mask = (min_time <= time_of_day) & (time_of_day <= max_time)
 
         # If time boundaries straddle midnight:
         else:
-            try:
-                mask = np.array([(t.time() >= min_time) or
-                                (t.time() <= max_time) for t in times.datetime])
-            except BaseException:
-                mask = np.bool_((times.datetime.time() >= min_time) or
-                                (times.datetime.time() <= max_time))
-        return mask
+            mask = (time_of_day >= min_time) | (time_of_day <= max_time)
+
+        # use np.bool so shape queries don't cause problems
+        return mask[()] if mask.ndim == 0 else mask
 
 
 class TimeConstraint(Constraint):
@@ -797,6 +1714,8 @@ class TimeConstraint(Constraint):
     all observing blocks are valid over the time limits used in calls
     to `is_observable` or `is_always_observable`.
     """
+    _cost = 0
+    depends_on_targets = False
 
     def __init__(self, min=None, max=None):
         """
@@ -846,10 +1765,53 @@ class TimeConstraint(Constraint):
         return mask
 
 
+def _get_phases(times, observer, periodic_event):
+    """
+    Calculate the phases of ``periodic_event`` at ``times``.
+
+    Cache the result in the ``observer``'s `~astroplan.ObserverCache`, so
+    that the phases are computed once per grid of times for all the phase
+    and eclipse constraints on the same event.
+
+    Parameters
+    ----------
+    times : `~astropy.time.Time`
+        Array of times.
+    observer : `~astroplan.Observer` or `None`
+        The observer, or `None` to compute the phases without caching them.
+    periodic_event : `~astroplan.periodic.PeriodicEvent`
+        The periodic event.
+
+    Returns
+    -------
+    phases : `~numpy.ndarray`
+        Phases at ``times``, on range [0, 1)
+    """
+    if observer is None:
+        return periodic_event.phase(times)
+
+    epoch_jd1, epoch_jd2 = periodic_event._two_part_jd(periodic_event.epoch)
+    pkey = (('phase', periodic_event.epoch.scale, float(epoch_jd1),
+             float(epoch_jd2), periodic_event.period.to(u.day).value) +
+            _make_time_key(times))
+
+    phases = observer.cache.get(pkey)
+    if phases is None:
+        phases = periodic_event.phase(times)
+        if isinstance(phases, np.ndarray):
+            # the phases are shared, so protect them from modifications
+            phases.flags.writeable = False
+        observer.cache.set(pkey, phases)
+
+    return phases
+
+
 class PrimaryEclipseConstraint(Constraint):
     """
     Constrain observations to times during primary eclipse.
     """
+    _cost = 0
+    depends_on_targets = False
 
     def __init__(self, eclipsing_system):
         """
@@ -861,14 +1823,16 @@ class PrimaryEclipseConstraint(Constraint):
         self.eclipsing_system = eclipsing_system
 
     def compute_constraint(self, times, observer=None, targets=None):
-        mask = self.eclipsing_system.in_primary_eclipse(times)
-        return mask
+        phases = _get_phases(times, observer, self.eclipsing_system)
+        return self.eclipsing_system._in_primary_eclipse(phases)
 
 
 class SecondaryEclipseConstraint(Constraint):
     """
     Constrain observations to times during secondary eclipse.
     """
+    _cost = 0
+    depends_on_targets = False
 
     def __init__(self, eclipsing_system):
         """
@@ -879,61 +1843,297 @@ class SecondaryEclipseConstraint(Constraint):
         """
         self.eclipsing_system = eclipsing_system
 
-    def compute_constraint(self, times, observer=None, targets=None):
-        mask = self.eclipsing_system.in_secondary_eclipse(times)
-        return mask
+    def compute_constraint(self, times, observer=None, targets=None):
+        phases = _get_phases(times, observer, self.eclipsing_system)
+        return self.eclipsing_system._in_secondary_eclipse(phases)
+
+
+class PhaseConstraint(Constraint):
+    """
+    Constrain observations to times in some range of phases for a periodic event
+    (e.g.~transiting exoplanets, eclipsing binaries).
+    """
+    _cost = 0
+    depends_on_targets = False
+
+    def __init__(self, periodic_event, min=None, max=None):
+        """
+        Parameters
+        ----------
+        periodic_event : `~astroplan.periodic.PeriodicEvent` or subclass
+            System on which to compute the phase. For example, the system
+            could be an eclipsing or non-eclipsing binary, or exoplanet system.
+        min : float (optional)
+            Minimum phase (inclusive) on interval [0, 1). Default is zero.
+        max : float (optional)
+            Maximum phase (inclusive) on interval [0, 1). Default is one.
+
+        Examples
+        --------
+        To constrain observations on orbital phases between 0.4 and 0.6,
+        >>> from astroplan import PeriodicEvent
+        >>> from astropy.time import Time
+        >>> import astropy.units as u
+        >>> binary = PeriodicEvent(epoch=Time('2017-01-01 02:00'), period=1*u.day)
+        >>> constraint = PhaseConstraint(binary, min=0.4, max=0.6)
+
+        The minimum and maximum phase must be described on the interval [0, 1).
+        To constrain observations on orbital phases between 0.6 and 1.2, for
+        example, you should subtract one from the second number:
+        >>> constraint = PhaseConstraint(binary, min=0.6, max=0.2)
+        """
+        self.periodic_event = periodic_event
+        if (min < 0) or (min > 1) or (max < 0) or (max > 1):
+            raise ValueError('The minimum of the PhaseConstraint must be within'
+                             ' the interval [0, 1).')
+        self.min = min if min is not None else 0.0
+        self.max = max if max is not None else 1.0
+
+    def compute_constraint(self, times, observer=None, targets=None):
+        phase = _get_phases(times, observer, self.periodic_event)
+
+        if self.max > self.min:
+            return (phase >= self.min) & (phase <= self.max)
+        return (phase >= self.min) | (phase <= self.max)
+
+
+# Default ratio between the spacings of the coarse and fine grids of times in
+# adaptive evaluations of constraints
+_ADAPTIVE_STRIDE = 8
+
+
+def _constraint_mask(constraints, observer, targets, times):
+    """
+    Combine ``constraints`` for every pair of ``targets`` and ``times``, with
+    targets along the first axis and times along the second.
+    """
+    return np.logical_and.reduce([
+        np.broadcast_to(constraint(observer, targets, times=times,
+                                   grid_times_targets=True),
+                        (len(targets), len(times)))
+        for constraint in constraints])
+
+
+def _paired_constraint_mask(constraints, observer, targets, times):
+    """
+    Combine ``constraints`` for each target of ``targets`` at the time of
+    ``times`` with the same index.
+    """
+    return np.logical_and.reduce([
+        np.broadcast_to(constraint(observer, targets, times=times),
+                        targets.shape)
+        for constraint in constraints])
+
+
+def _adaptive_constraint_mask(constraints, observer, targets, times, stride):
+    """
+    Combine ``constraints`` for ``targets`` on the grid ``times``, with an
+    adaptive coarse-to-fine evaluation.
+
+    The constraints are first evaluated on a coarse grid made of every
+    ``stride``-th time of ``times``. Each interval between two coarse times
+    is then evaluated at full resolution, for a target, if the target is
+    observable at either end, or if the result of any of the constraints
+    differs between its ends. The intervals which are skipped are those
+    where every constraint has the same result at both ends and at least
+    one of them rules the target out, so the result is the same as the
+    evaluation on the full grid unless the result of a single constraint
+    changes more than once between two coarse times, e.g. for a short
+    window above an altitude limit.
+
+    Parameters
+    ----------
+    constraints : list of `~astroplan.constraints.Constraint`
+        Observational constraints
+    observer : `~astroplan.Observer`
+        The observer who has constraints ``constraints``
+    targets : {list, `~astropy.coordinates.SkyCoord`, `~astroplan.FixedTarget`}
+        Target or list of targets
+    times : `~astropy.time.Time`
+        One-dimensional array of times
+    stride : int
+        Number of times of ``times`` per interval of the coarse grid
+
+    Returns
+    -------
+    mask : `~numpy.ndarray`
+        Boolean array of the combined constraints, with targets along the
+        first axis and times along the second
+    """
+    targets = get_skycoord(targets)
+    if targets.isscalar:
+        targets = targets.reshape((1,))
+    shape = (len(targets), len(times))
+
+    coarse_index = np.unique(np.append(np.arange(0, len(times), stride),
+                                       len(times) - 1))
+    coarse_times = times[coarse_index]
+    applied = [np.broadcast_to(constraint(observer, targets, times=coarse_times,
+                                          grid_times_targets=True),
+                               (len(targets), len(coarse_times)))
+               for constraint in constraints]
+    coarse = np.logical_and.reduce(applied)
+
+    # start from the result at the beginning of each coarse interval
+    interval = np.searchsorted(coarse_index, np.arange(len(times)),
+                               side='right') - 1
+    mask = coarse[:, interval]
+
+    # and refine, for each target, the intervals next to an observable time
+    # or where any of the constraints changes
+    refine = coarse[:, :-1] | coarse[:, 1:]
+    for applied_constraint in applied:
+        refine |= applied_constraint[:, :-1] != applied_constraint[:, 1:]
+    target_index, interval_index = np.nonzero(refine)
+    starts = coarse_index[interval_index] + 1
+    counts = coarse_index[interval_index + 1] - starts
+    n_refined = counts.sum()
+    if n_refined:
+        offsets = np.arange(n_refined) - np.repeat(np.cumsum(counts) - counts,
+                                                   counts)
+        refined_targets = np.repeat(target_index, counts)
+        refined_times = np.repeat(starts, counts) + offsets
+        mask[refined_targets, refined_times] = _paired_constraint_mask(
+            constraints, observer, targets[refined_targets],
+            times[refined_times])
+
+    return mask.reshape(shape)
+
+
+def _adaptive_stride(adaptive, times):
+    """
+    Stride of the coarse grid for the ``adaptive`` argument of the
+    observability functions, or zero if the grid ``times`` should be
+    evaluated in full.
+    """
+    stride = _ADAPTIVE_STRIDE if adaptive is True else int(adaptive)
+    if stride < 2 or times.ndim != 1 or len(times) <= stride + 1:
+        return 0
+    return stride
+
+
+# Number of set bits in each possible byte
+_POPCOUNT = np.array([bin(i).count('1') for i in range(256)], dtype=np.uint8)
+
+
+def _pack_bits(result, packed_ones):
+    """
+    Pack a boolean constraint result, with targets along the first axis and
+    times along the second, into bits along the times axis.
+
+    Results that do not depend on the times, of length one along the times
+    axis, are expanded to all the times. ``packed_ones`` is the packed array
+    of ones for all the times, whose padding bits are zero.
+    """
+    result = np.asarray(result, dtype=bool)
+    if result.shape[-1] == 1:
+        return np.where(result, packed_ones, np.uint8(0))
+    return np.packbits(result, axis=-1)
 
 
-class PhaseConstraint(Constraint):
+def _count_bits(packed):
     """
-    Constrain observations to times in some range of phases for a periodic event
-    (e.g.~transiting exoplanets, eclipsing binaries).
+    Number of set bits along the last axis of a packed array.
     """
+    return _POPCOUNT[packed].sum(axis=-1)
 
-    def __init__(self, periodic_event, min=None, max=None):
-        """
-        Parameters
-        ----------
-        periodic_event : `~astroplan.periodic.PeriodicEvent` or subclass
-            System on which to compute the phase. For example, the system
-            could be an eclipsing or non-eclipsing binary, or exoplanet system.
-        min : float (optional)
-            Minimum phase (inclusive) on interval [0, 1). Default is zero.
-        max : float (optional)
-            Maximum phase (inclusive) on interval [0, 1). Default is one.
 
-        Examples
-        --------
-        To constrain observations on orbital phases between 0.4 and 0.6,
-        >>> from astroplan import PeriodicEvent
-        >>> from astropy.time import Time
-        >>> import astropy.units as u
-        >>> binary = PeriodicEvent(epoch=Time('2017-01-01 02:00'), period=1*u.day)
-        >>> constraint = PhaseConstraint(binary, min=0.4, max=0.6)
+def _evaluate_constraints(constraints, observer, targets, times=None,
+                          time_range=None, time_grid_resolution=0.5*u.hour,
+                          reduction=np.any, packed=False):
+    """
+    Evaluate the combination of ``constraints`` for ``targets``, and reduce
+    the result over the times with ``reduction``.
 
-        The minimum and maximum phase must be described on the interval [0, 1).
-        To constrain observations on orbital phases between 0.6 and 1.2, for
-        example, you should subtract one from the second number:
-        >>> constraint = PhaseConstraint(binary, min=0.6, max=0.2)
-        """
-        self.periodic_event = periodic_event
-        if (min < 0) or (min > 1) or (max < 0) or (max > 1):
-            raise ValueError('The minimum of the PhaseConstraint must be within'
-                             ' the interval [0, 1).')
-        self.min = min if min is not None else 0.0
-        self.max = max if max is not None else 1.0
+    The constraints are evaluated from the cheapest to the most expensive,
+    and their results are combined into a single boolean array in place.
+    Whenever the result of a target is settled, i.e. when it is False at
+    all times for ``reduction=np.any`` or at any time for
+    ``reduction=np.all``, the target is dropped from the evaluation of the
+    remaining constraints. The results of constraints that do not depend on
+    the times or on the targets are only broadcast when they are combined.
 
-    def compute_constraint(self, times, observer=None, targets=None):
-        phase = self.periodic_event.phase(times)
+    Parameters
+    ----------
+    constraints : list of `~astroplan.constraints.Constraint`
+        Observational constraints
+    observer : `~astroplan.Observer`
+        The observer who has constraints ``constraints``
+    targets : {list, `~astropy.coordinates.SkyCoord`, `~astroplan.FixedTarget`}
+        Target or list of targets
+    times : `~astropy.time.Time` (optional)
+        Array of times on which to test the constraint
+    time_range : `~astropy.time.Time` (optional)
+        Lower and upper bounds on time sequence
+    time_grid_resolution : `~astropy.units.Quantity` (optional)
+        Spacing of the times in ``time_range``
+    reduction : {`~numpy.any`, `~numpy.all`}
+        Reduction of the combined constraints over the times of each target
+    packed : bool (optional)
+        Combine the constraints as arrays of bits packed along the times, if
+        ``times`` is one-dimensional.
 
-        mask = np.where(self.max > self.min,
-                        (phase >= self.min) & (phase <= self.max),
-                        (phase >= self.min) | (phase <= self.max))
-        return mask
+    Returns
+    -------
+    reduced : `~numpy.ndarray`
+        Array of booleans of same length as ``targets``
+    """
+    if times is None and time_range is not None:
+        times = time_grid_from_range(time_range,
+                                     time_resolution=time_grid_resolution)
+    elif not isinstance(times, Time):
+        times = Time(times)
+
+    targets = get_skycoord(targets)
+    if targets.isscalar:
+        targets = targets.reshape((1,))
+    remaining = np.arange(len(targets))
+
+    combine = np.logical_and
+    reduce_times = functools.partial(reduction, axis=1)
+    if packed and times.ndim == 1:
+        packed_ones = np.packbits(np.ones(times.size, dtype=bool))
+        combine = np.bitwise_and
+        if reduction is np.all:
+            def reduce_times(combined):
+                return np.all(combined == packed_ones, axis=1)
+    else:
+        packed = False
+
+    # the results are combined with a targets axis first and a times axis
+    # second, of length one for constraints that do not depend on them
+    combined = None
+    for constraint in sorted(constraints, key=lambda c: c._cost):
+        applied = np.asarray(_compute_constraint(
+            constraint, times, observer, targets[remaining][:, np.newaxis]))
+        if applied.ndim < 2:
+            applied = applied.reshape((1, -1))
+        if packed:
+            applied = _pack_bits(applied, packed_ones)
+
+        if combined is None:
+            combined = np.array(applied, dtype=np.uint8 if packed else bool)
+        elif np.broadcast(combined, applied).shape == combined.shape:
+            combine(combined, applied, out=combined)
+        else:
+            combined = combine(combined, applied)
+
+        settled = np.broadcast_to(~reduce_times(combined), remaining.shape)
+        if np.any(settled):
+            remaining = remaining[~settled]
+            if combined.shape[0] == len(settled):
+                combined = combined[~settled]
+            if not len(remaining):
+                break
+
+    reduced = np.zeros(len(targets), dtype=bool)
+    reduced[remaining] = reduce_times(combined)
+    return reduced
 
 
 def is_always_observable(constraints, observer, targets, times=None,
-                         time_range=None, time_grid_resolution=0.5*u.hour):
+                         time_range=None, time_grid_resolution=0.5*u.hour,
+                         adaptive=False, n_jobs=None, packed=False):
     """
     A function to determine whether ``targets`` are always observable throughout
     ``time_range`` given constraints in the ``constraints_list`` for a
@@ -964,6 +2164,24 @@ def is_always_observable(constraints, observer, targets, times=None,
         linearly-spaced times separated by ``time_resolution``. Default is 0.5
         hours.
 
+    adaptive : bool or int (optional)
+        If True, or an integer stride, evaluate the constraints on a coarse
+        grid made of every ``adaptive``-th time (every 8th if True), and
+        then at full resolution only between the coarse times where a
+        target is observable, or where the result of any of the constraints
+        changes. This gives the same result as the full grid unless the
+        result of a single constraint changes more than once between two
+        coarse times. Default is False.
+
+    n_jobs : int (optional)
+        Number of worker processes between which the targets are shared, or
+        a negative number to use all CPUs. Default is None, to evaluate the
+        constraints in this process.
+
+    packed : bool (optional)
+        If True, combine the constraints as arrays of bits, eight times per
+        byte, rather than as arrays of booleans. Default is False.
+
     Returns
     -------
     ever_observable : list
@@ -973,17 +2191,32 @@ def is_always_observable(constraints, observer, targets, times=None,
     if not hasattr(constraints, '__len__'):
         constraints = [constraints]
 
-    applied_constraints = [constraint(observer, targets, times=times,
-                                      time_range=time_range,
-                                      time_grid_resolution=time_grid_resolution,
-                                      grid_times_targets=True)
-                           for constraint in constraints]
-    constraint_arr = np.logical_and.reduce(applied_constraints)
-    return np.all(constraint_arr, axis=1)
+    if times is None and time_range is not None:
+        times = time_grid_from_range(time_range,
+                                     time_resolution=time_grid_resolution)
+
+    if _n_workers(n_jobs):
+        targets = get_skycoord(targets)
+        if targets.isscalar:
+            targets = targets.reshape((1,))
+        return _map_shards(is_always_observable, constraints, observer, targets,
+                           (len(targets),), bool, n_jobs, times=times,
+                           adaptive=adaptive, packed=packed)
+
+    stride = _adaptive_stride(adaptive, times)
+    if stride:
+        return np.all(_adaptive_constraint_mask(constraints, observer, targets,
+                                                times, stride), axis=1)
+
+    return _evaluate_constraints(constraints, observer, targets, times=times,
+                                 time_range=time_range,
+                                 time_grid_resolution=time_grid_resolution,
+                                 reduction=np.all, packed=packed)
 
 
 def is_observable(constraints, observer, targets, times=None,
-                  time_range=None, time_grid_resolution=0.5*u.hour):
+                  time_range=None, time_grid_resolution=0.5*u.hour,
+                  adaptive=False, n_jobs=None, packed=False):
     """
     Determines if the ``targets`` are observable during ``time_range`` given
     constraints in ``constraints_list`` for a particular ``observer``.
@@ -1013,6 +2246,24 @@ def is_observable(constraints, observer, targets, times=None,
         linearly-spaced times separated by ``time_resolution``. Default is 0.5
         hours.
 
+    adaptive : bool or int (optional)
+        If True, or an integer stride, evaluate the constraints on a coarse
+        grid made of every ``adaptive``-th time (every 8th if True), and
+        then at full resolution only between the coarse times where a
+        target is observable, or where the result of any of the constraints
+        changes. This gives the same result as the full grid unless the
+        result of a single constraint changes more than once between two
+        coarse times. Default is False.
+
+    n_jobs : int (optional)
+        Number of worker processes between which the targets are shared, or
+        a negative number to use all CPUs. Default is None, to evaluate the
+        constraints in this process.
+
+    packed : bool (optional)
+        If True, combine the constraints as arrays of bits, eight times per
+        byte, rather than as arrays of booleans. Default is False.
+
     Returns
     -------
     ever_observable : list
@@ -1022,13 +2273,27 @@ def is_observable(constraints, observer, targets, times=None,
     if not hasattr(constraints, '__len__'):
         constraints = [constraints]
 
-    applied_constraints = [constraint(observer, targets, times=times,
-                                      time_range=time_range,
-                                      time_grid_resolution=time_grid_resolution,
-                                      grid_times_targets=True)
-                           for constraint in constraints]
-    constraint_arr = np.logical_and.reduce(applied_constraints)
-    return np.any(constraint_arr, axis=1)
+    if times is None and time_range is not None:
+        times = time_grid_from_range(time_range,
+                                     time_resolution=time_grid_resolution)
+
+    if _n_workers(n_jobs):
+        targets = get_skycoord(targets)
+        if targets.isscalar:
+            targets = targets.reshape((1,))
+        return _map_shards(is_observable, constraints, observer, targets,
+                           (len(targets),), bool, n_jobs, times=times,
+                           adaptive=adaptive, packed=packed)
+
+    stride = _adaptive_stride(adaptive, times)
+    if stride:
+        return np.any(_adaptive_constraint_mask(constraints, observer, targets,
+                                                times, stride), axis=1)
+
+    return _evaluate_constraints(constraints, observer, targets, times=times,
+                                 time_range=time_range,
+                                 time_grid_resolution=time_grid_resolution,
+                                 reduction=np.any, packed=packed)
 
 
 def is_event_observable(constraints, observer, target, times=None,
@@ -1071,20 +2336,219 @@ def is_event_observable(constraints, observer, target, times=None,
         constraint_arr = np.logical_and.reduce(applied_constraints)
 
     else:
-        times_ing = times_ingress_egress[:, 0]
-        times_egr = times_ingress_egress[:, 1]
-        applied_constraints_ing = [constraint(observer, target, times=times_ing,
-                                              grid_times_targets=True)
-                                   for constraint in constraints]
-        applied_constraints_egr = [constraint(observer, target, times=times_egr,
-                                              grid_times_targets=True)
-                                   for constraint in constraints]
-
-        constraint_arr = np.logical_and(np.logical_and.reduce(applied_constraints_ing),
-                                        np.logical_and.reduce(applied_constraints_egr))
+        # evaluate the constraints once on the interleaved ingress and
+        # egress times, then require both for each event
+        n_events = len(times_ingress_egress)
+        applied_constraints = [constraint(observer, target,
+                                          times=times_ingress_egress.ravel(),
+                                          grid_times_targets=True)
+                               for constraint in constraints]
+        constraint_arr = np.logical_and.reduce(applied_constraints)
+        constraint_arr = constraint_arr.reshape(
+            constraint_arr.shape[:-1] + (n_events, 2)).all(axis=-1)
     return constraint_arr
 
 
+def event_observability_table(constraints, observer, systems, targets,
+                              time_range, eclipse='primary'):
+    """
+    Creates a table of the eclipses of many eclipsing ``systems`` during
+    ``time_range``, with their observability at ingress, mid-eclipse and
+    egress given the constraints in ``constraints`` for ``observer``.
+
+    The times of the eclipses of all the systems are generated at once, and
+    the constraints are evaluated once on all the ingress, mid-eclipse and
+    egress times, so that the ephemerides are shared between all the events.
+
+    .. warning::
+        Barycentric offsets are ignored, and the secondary eclipses are
+        assumed at phase 0.5, as in
+        `~astroplan.EclipsingSystem.next_secondary_eclipse_time`.
+
+    Parameters
+    ----------
+    constraints : list or `~astroplan.constraints.Constraint`
+        Observational constraint(s)
+
+    observer : `~astroplan.Observer`
+        The observer who has constraints ``constraints``
+
+    systems : list of `~astroplan.EclipsingSystem`
+        Eclipsing systems, with durations
+
+    targets : {list, `~astropy.coordinates.SkyCoord`, `~astroplan.FixedTarget`}
+        Target of each system of ``systems``
+
+    time_range : `~astropy.time.Time`
+        Lower and upper bounds on the mid-eclipse times of the events
+
+    eclipse : {'primary', 'secondary'} (optional)
+        Whether to find primary or secondary eclipses. Default is
+        ``'primary'``.
+
+    Returns
+    -------
+    event_table : `~astropy.table.Table`
+        A Table with a row for each eclipse, ordered by system then time,
+        with the index and name of the system, the ingress, mid-eclipse and
+        egress times, whether the target is observable at each of these
+        times, and whether it is observable at all three.
+    """
+    if not hasattr(constraints, '__len__'):
+        constraints = [constraints]
+
+    if eclipse not in ('primary', 'secondary'):
+        raise ValueError("eclipse must be 'primary' or 'secondary'.")
+
+    targets = get_skycoord(targets)
+    if len(targets) != len(systems):
+        raise ValueError("There must be one target for each system.")
+
+    if any(system.duration is None for system in systems):
+        raise ValueError("The durations of all systems are required.")
+
+    start, end = time_range[0], time_range[1]
+    periods = np.array([system.period.to(u.day).value for system in systems])
+    durations = np.array([system.duration.to(u.day).value
+                          for system in systems])
+
+    # mid-eclipse k of system i is at first_eclipses[i] + k * periods[i]
+    # days from the start of the time range
+    first_eclipses = (Time([system.epoch for system in systems]) -
+                      start).to(u.day).value
+    if eclipse == 'secondary':
+        first_eclipses = first_eclipses + 0.5 * periods
+    duration = (end - start).to(u.day).value
+    first_k = np.ceil(-first_eclipses / periods)
+    last_k = np.floor((duration - first_eclipses) / periods)
+    n_eclipses = np.maximum(last_k - first_k + 1, 0).astype(int)
+
+    system_index = np.repeat(np.arange(len(systems)), n_eclipses)
+    k = (first_k[system_index] + np.arange(len(system_index)) -
+         (np.cumsum(n_eclipses) - n_eclipses)[system_index])
+    mid_eclipses = first_eclipses[system_index] + k * periods[system_index]
+    half_durations = durations[system_index] / 2
+
+    # ingress, mid-eclipse and egress times of all the events, flattened
+    event_times = start + np.concatenate([mid_eclipses - half_durations,
+                                          mid_eclipses,
+                                          mid_eclipses + half_durations])*u.day
+    if len(system_index):
+        observable = _paired_constraint_mask(
+            constraints, observer, targets[np.tile(system_index, 3)],
+            event_times)
+    else:
+        observable = np.zeros(0, dtype=bool)
+    observable = observable.reshape(3, -1)
+    event_times = event_times.reshape(3, -1)
+
+    tab = table.Table()
+    tab['system index'] = system_index
+    tab['system name'] = [str(systems[i].name) for i in system_index]
+    for i, name in enumerate(['ingress', 'mid-eclipse', 'egress']):
+        tab[name] = event_times[i]
+    for i, name in enumerate(['ingress', 'mid-eclipse', 'egress']):
+        tab['observable at ' + name] = observable[i]
+    tab['observable'] = observable.all(axis=0)
+
+    tab.meta['time_range'] = time_range
+    tab.meta['observer'] = observer
+    tab.meta['constraints'] = constraints
+    return tab
+
+
+# Spacing of the times sampled first by months_observable
+_MONTHS_SAMPLE_SPACING = 3*u.hour
+
+
+def _months_possible(constraints, observer, targets, times, months):
+    """
+    Whether each of ``targets`` can be observable in each month, from the
+    hour angles at which fixed targets rise above the altitude limits of
+    ``constraints``, and the local sidereal times at night.
+
+    A target can only meet the `AltitudeConstraint` and `AirmassConstraint`
+    limits of ``constraints`` while its hour angle is within a range given by
+    its declination and the latitude of ``observer``, and it can only meet
+    the `AtNightConstraint` of ``constraints`` when the local sidereal time
+    of one of the night ``times`` of the month falls in that range.
+
+    Parameters
+    ----------
+    constraints : list of `~astroplan.constraints.Constraint`
+        Observational constraints
+    observer : `~astroplan.Observer`
+        The observer who has constraints ``constraints``
+    targets : `~astropy.coordinates.SkyCoord`
+        One-dimensional array of targets
+    times : `~astropy.time.Time`
+        One-dimensional array of times
+    months : `~numpy.ndarray`
+        Month of each time of ``times``, from 1 to 12
+
+    Returns
+    -------
+    possible : `~numpy.ndarray`
+        Boolean array with targets along the first axis and months along the
+        second, which is False where the target is certainly not observable
+    """
+    possible = np.ones((len(targets), 12), dtype=bool)
+    min_altitudes = [constraint.min for constraint in constraints
+                     if isinstance(constraint, AltitudeConstraint) and
+                     not isinstance(constraint, AirmassConstraint) and
+                     constraint.boolean_constraint]
+    min_altitudes += [_airmass_altitude(constraint.max)
+                      for constraint in constraints
+                      if isinstance(constraint, AirmassConstraint) and
+                      constraint.boolean_constraint and
+                      constraint.max is not None]
+    if not min_altitudes or _daily_altitude_range(observer, targets) is None:
+        return possible
+
+    # coordinates of the targets referred to the equator and equinox of the
+    # middle of ``times``, which the sidereal times are measured from
+    middle = times[len(times) // 2]
+    precessed = targets.transform_to(PrecessedGeocentric(equinox=middle,
+                                                         obstime=middle))
+
+    # half-width of the range of hour angles above the altitude limit, with
+    # margins for refraction, nutation and precession within ``times``
+    min_altitude = u.Quantity(min_altitudes).max() - _PREFILTER_MARGIN
+    dec = precessed.dec
+    lat = observer.location.lat
+    with np.errstate(divide='ignore', invalid='ignore'):
+        cos_hour_angle = ((np.sin(min_altitude) - np.sin(lat) * np.sin(dec)) /
+                          (np.cos(lat) * np.cos(dec))).to(u.one).value
+    half_width = (np.degrees(np.arccos(np.clip(cos_hour_angle, -1, 1))) +
+                  _PREFILTER_MARGIN.to(u.deg).value)
+    # targets which never rise above the altitude limit
+    possible[cos_hour_angle > 1] = False
+
+    night = np.ones(len(times), dtype=bool)
+    for constraint in constraints:
+        if isinstance(constraint, AtNightConstraint):
+            night &= np.broadcast_to(np.reshape(_compute_constraint(
+                constraint, times, observer, None), (-1,)), night.shape)
+
+    lst = _get_local_sidereal_times(times, observer).to(u.deg).value
+    # the LSTs at which each target is in its range of hour angles, as
+    # offsets from the beginning of the range, which wraps around 360 deg
+    ra = precessed.ra.to(u.deg).value
+    lower = (ra - half_width) % 360
+    for month in range(1, 13):
+        night_lst = np.sort(lst[night & (months == month)])
+        if not len(night_lst):
+            possible[:, month-1] = False
+            continue
+        # the first night LST at or after the beginning of the range of each
+        # target, wrapping around to the earliest LST
+        first = np.searchsorted(night_lst, lower) % len(night_lst)
+        offset = (night_lst[first] - lower) % 360
+        possible[:, month-1] &= offset <= 2 * half_width
+
+    return possible
+
+
 def months_observable(constraints, observer, targets,
                       time_grid_resolution=0.5*u.hour):
     """
@@ -1116,8 +2580,6 @@ def months_observable(constraints, observer, targets,
         January maps to 1, February maps to 2, etc.
 
     """
-    # TODO: This method could be sped up a lot by dropping to the trigonometric
-    # altitude calculations.
     if not hasattr(constraints, '__len__'):
         constraints = [constraints]
 
@@ -1125,26 +2587,130 @@ def months_observable(constraints, observer, targets,
     # extrapolation off of the IERS tables
     time_range = Time(['2014-01-01', '2014-12-31'])
     times = time_grid_from_range(time_range, time_grid_resolution)
+    months = erfa.d2dtf(times.scale.upper().encode('ascii'), 0,
+                        times.jd1, times.jd2)[1]
+
+    targets = get_skycoord(targets)
+    if targets.isscalar:
+        targets = targets.reshape((1,))
+
+    # targets which cannot be observable in a month, from the hour angles at
+    # which they are above the altitude limits and the sidereal times at
+    # night, are not evaluated for that month
+    possible = _months_possible(constraints, observer, targets, times, months)
+
+    # Most targets are observable at one of a few times per night in the
+    # months when they are observable at all, so the constraints are first
+    # evaluated on a sparse sample of the times, and then on the other times
+    # of each month only for the targets that are not yet known to be
+    # observable during that month
+    stride = max(int(np.round((_MONTHS_SAMPLE_SPACING /
+                               time_grid_resolution).decompose().value)), 1)
+    sampled = np.arange(len(times)) % stride == 0
+
+    observable = np.zeros((len(targets), 12), dtype=bool)
+    for month in range(1, 13):
+        in_month = months == month
+        candidates = np.nonzero(possible[:, month-1])[0]
+        if len(candidates):
+            observable[candidates, month-1] = _evaluate_constraints(
+                constraints, observer, targets[candidates],
+                times=times[in_month & sampled], reduction=np.any)
+        undecided = candidates[~observable[candidates, month-1]]
+        if len(undecided) and np.any(in_month & ~sampled):
+            observable[undecided, month-1] = _evaluate_constraints(
+                constraints, observer, targets[undecided],
+                times=times[in_month & ~sampled], reduction=np.any)
+
+    return [set(int(month) for month in np.nonzero(target_months)[0] + 1)
+            for target_months in observable]
+
+
+def _observability_times(times, time_range, time_grid_resolution):
+    """
+    Grid of times of an observability table, and whether the table is for a
+    24 hour period centered on a scalar ``time_range``.
+    """
+    is_24hr_table = False
+    if hasattr(time_range, 'isscalar') and time_range.isscalar:
+        time_range = (time_range-12*u.hour, time_range+12*u.hour)
+        is_24hr_table = True
+
+    if times is None and time_range is not None:
+        times = time_grid_from_range(time_range,
+                                     time_resolution=time_grid_resolution)
+    return times, is_24hr_table
+
+
+def _observability_fractions(constraints, observer, targets, times,
+                             adaptive=False, packed=False):
+    """
+    Fraction of the times of ``times`` at which each of ``targets`` is
+    observable.
+    """
+    stride = _adaptive_stride(adaptive, times)
+    if stride:
+        constraint_arr = _adaptive_constraint_mask(constraints, observer,
+                                                   targets, times, stride)
+    elif packed:
+        combined = None
+        for constraint in constraints:
+            applied = constraint(observer, targets, times=times,
+                                 grid_times_targets=True, packed=True)
+            if combined is None:
+                combined = np.array(applied)
+            else:
+                np.bitwise_and(combined, applied, out=combined)
+        return _count_bits(combined) / len(times)
+    else:
+        applied_constraints = [constraint(observer, targets, times=times,
+                                          grid_times_targets=True)
+                               for constraint in constraints]
+        constraint_arr = np.logical_and.reduce(applied_constraints)
+
+    return np.sum(constraint_arr, axis=1) / constraint_arr.shape[1]
+
+
+def _observability_rows(constraints, observer, targets, times, adaptive,
+                        is_24hr_table, fractions=None, packed=False):
+    """
+    Rows of the observability table of ``targets``, without metadata.
+    """
+    if fractions is None:
+        fractions = _observability_fractions(constraints, observer, targets,
+                                             times, adaptive, packed)
 
-    # TODO: This method could be sped up a lot by dropping to the trigonometric
-    # altitude calculations.
+    colnames = ['target name', 'ever observable', 'always observable',
+                'fraction of time observable']
+
+    target_names = [target.name for target in targets]
+    ever_obs = fractions > 0
+    always_obs = fractions == 1
+
+    tab = table.Table(names=colnames, data=[target_names, ever_obs, always_obs,
+                                            fractions])
+
+    if is_24hr_table:
+        tab['time observable'] = tab['fraction of time observable'] * 24*u.hour
 
-    applied_constraints = [constraint(observer, targets,
-                                      times=times,
-                                      grid_times_targets=True)
-                           for constraint in constraints]
-    constraint_arr = np.logical_and.reduce(applied_constraints)
+    return tab
 
-    months_observable = []
-    for target, observable in zip(targets, constraint_arr):
-        s = set([t.datetime.month for t in times[observable]])
-        months_observable.append(s)
 
-    return months_observable
+def _set_observability_meta(tab, times, observer, constraints):
+    """
+    Store the times, observer and constraints of an observability table in
+    its metadata.
+    """
+    tab.meta['times'] = times.datetime
+    tab.meta['observer'] = observer
+    tab.meta['constraints'] = constraints
+    return tab
 
 
 def observability_table(constraints, observer, targets, times=None,
-                        time_range=None, time_grid_resolution=0.5*u.hour):
+                        time_range=None, time_grid_resolution=0.5*u.hour,
+                        adaptive=False, chunk_size=None, n_jobs=None,
+                        packed=False):
     """
     Creates a table with information about observability for all  the ``targets``
     over the requested ``time_range``, given the constraints in
@@ -1176,6 +2742,31 @@ def observability_table(constraints, observer, targets, times=None,
         linearly-spaced times separated by ``time_resolution``. Default is 0.5
         hours.
 
+    adaptive : bool or int (optional)
+        If True, or an integer stride, evaluate the constraints on a coarse
+        grid made of every ``adaptive``-th time (every 8th if True), and
+        then at full resolution only between the coarse times where a
+        target is observable, or where the result of any of the constraints
+        changes. This gives the same result as the full grid unless the
+        result of a single constraint changes more than once between two
+        coarse times. Default is False.
+
+    chunk_size : int (optional)
+        If given, evaluate the constraints for at most ``chunk_size`` targets
+        at a time, and reduce them to rows of the table before evaluating the
+        next targets, so that the memory used does not grow with the number
+        of targets. Default is None, to evaluate all targets at once.
+
+    n_jobs : int (optional)
+        Number of worker processes between which the targets are shared, in
+        shards of ``chunk_size`` targets if given, or a negative number to
+        use all CPUs. Default is None, to evaluate the constraints in this
+        process.
+
+    packed : bool (optional)
+        If True, combine the constraints as arrays of bits, eight times per
+        byte, rather than as arrays of booleans. Default is False.
+
     Returns
     -------
     observability_table : `~astropy.table.Table`
@@ -1192,44 +2783,274 @@ def observability_table(constraints, observer, targets, times=None,
     if not hasattr(constraints, '__len__'):
         constraints = [constraints]
 
-    is_24hr_table = False
-    if hasattr(time_range, 'isscalar') and time_range.isscalar:
-        time_range = (time_range-12*u.hour, time_range+12*u.hour)
-        is_24hr_table = True
+    times, is_24hr_table = _observability_times(times, time_range,
+                                                time_grid_resolution)
+
+    if _n_workers(n_jobs):
+        fractions = _map_shards(_observability_fractions, constraints,
+                                observer, get_skycoord(targets),
+                                (len(targets),), float, n_jobs,
+                                shard_size=chunk_size, times=times,
+                                adaptive=adaptive, packed=packed)
+        tab = _observability_rows(constraints, observer, targets, times,
+                                  adaptive, is_24hr_table, fractions)
+    elif chunk_size is None:
+        tab = _observability_rows(constraints, observer, targets, times,
+                                  adaptive, is_24hr_table, packed=packed)
+    else:
+        tab = table.vstack([
+            _observability_rows(constraints, observer,
+                                targets[start:start+chunk_size], times,
+                                adaptive, is_24hr_table, packed=packed)
+            for start in range(0, len(targets), chunk_size)])
 
-    applied_constraints = [constraint(observer, targets, times=times,
-                                      time_range=time_range,
-                                      time_grid_resolution=time_grid_resolution,
-                                      grid_times_targets=True)
-                           for constraint in constraints]
-    constraint_arr = np.logical_and.reduce(applied_constraints)
+    return _set_observability_meta(tab, times, observer, constraints)
 
-    colnames = ['target name', 'ever observable', 'always observable',
-                'fraction of time observable']
 
-    target_names = [target.name for target in targets]
-    ever_obs = np.any(constraint_arr, axis=1)
-    always_obs = np.all(constraint_arr, axis=1)
-    frac_obs = np.sum(constraint_arr, axis=1) / constraint_arr.shape[1]
+def iter_observability_table(constraints, observer, targets, times=None,
+                             time_range=None, time_grid_resolution=0.5*u.hour,
+                             adaptive=False, chunk_size=1000):
+    """
+    Yields the observability table of `~astroplan.observability_table` in
+    chunks of at most ``chunk_size`` targets, so that catalogs of any length
+    can be processed in bounded memory.
 
-    tab = table.Table(names=colnames, data=[target_names, ever_obs, always_obs,
-                                            frac_obs])
+    Parameters
+    ----------
+    constraints : list or `~astroplan.constraints.Constraint`
+        Observational constraint(s)
 
-    if times is None and time_range is not None:
-        times = time_grid_from_range(time_range,
-                                     time_resolution=time_grid_resolution)
+    observer : `~astroplan.Observer`
+        The observer who has constraints ``constraints``
 
-    if is_24hr_table:
-        tab['time observable'] = tab['fraction of time observable'] * 24*u.hour
+    targets : list of `~astroplan.FixedTarget`
+        List of targets
 
-    tab.meta['times'] = times.datetime
-    tab.meta['observer'] = observer
-    tab.meta['constraints'] = constraints
+    times : `~astropy.time.Time` (optional)
+        Array of times on which to test the constraint
 
-    return tab
+    time_range : `~astropy.time.Time` (optional)
+        Lower and upper bounds on time sequence, with spacing
+        ``time_resolution``. This will be passed as the first argument into
+        `~astroplan.time_grid_from_range`. If a single (scalar) time, the table
+        will be for a 24 hour period centered on that time.
+
+    time_grid_resolution : `~astropy.units.Quantity` (optional)
+        If ``time_range`` is specified, determine whether constraints are met
+        between test times in ``time_range`` by checking constraint at
+        linearly-spaced times separated by ``time_resolution``. Default is 0.5
+        hours.
+
+    adaptive : bool or int (optional)
+        If True, or an integer stride, evaluate the constraints with the
+        adaptive coarse-to-fine evaluation of
+        `~astroplan.observability_table`. Default is False.
+
+    chunk_size : int (optional)
+        Maximum number of targets per chunk. Default is 1000.
+
+    Yields
+    ------
+    observability_table : `~astropy.table.Table`
+        Observability table of the next ``chunk_size`` targets, with the
+        columns and metadata of `~astroplan.observability_table`.
+    """
+    if not hasattr(constraints, '__len__'):
+        constraints = [constraints]
+
+    times, is_24hr_table = _observability_times(times, time_range,
+                                                time_grid_resolution)
+
+    for start in range(0, len(targets), chunk_size):
+        tab = _observability_rows(constraints, observer,
+                                  targets[start:start+chunk_size], times,
+                                  adaptive, is_24hr_table)
+        yield _set_observability_meta(tab, times, observer, constraints)
+
+
+def observability_windows(constraints, observer, targets, time_range,
+                          time_grid_resolution=0.5*u.hour, precision=1*u.min,
+                          adaptive=False, chunk_size=1000):
+    """
+    Finds the windows of time during which each of the ``targets`` is
+    observable within ``time_range``, given the constraints in
+    ``constraints`` for ``observer``.
+
+    The constraints are evaluated on a grid of times spaced by
+    ``time_grid_resolution``, and each change of their combined result is
+    then located by bisection to within ``precision``. The windows are
+    returned in a compressed form: the windows of the ``i``-th target are
+    ``starts[offsets[i]:offsets[i+1]]`` to ``ends[offsets[i]:offsets[i+1]]``.
+
+    Parameters
+    ----------
+    constraints : list or `~astroplan.constraints.Constraint`
+        Observational constraint(s)
+
+    observer : `~astroplan.Observer`
+        The observer who has constraints ``constraints``
+
+    targets : {list, `~astropy.coordinates.SkyCoord`, `~astroplan.FixedTarget`}
+        Target or list of targets
+
+    time_range : `~astropy.time.Time`
+        Lower and upper bounds on time sequence, with spacing
+        ``time_resolution``. This will be passed as the first argument into
+        `~astroplan.time_grid_from_range`.
+
+    time_grid_resolution : `~astropy.units.Quantity` (optional)
+        Spacing of the grid of times on which the constraints are evaluated
+        before the edges of the windows are refined. Windows shorter than
+        this spacing may be missed. Default is 0.5 hours.
+
+    precision : `~astropy.units.Quantity` (optional)
+        Precision to which the edges of the windows are located. The
+        constraints are met at the start and end of each window. Default is
+        1 minute.
+
+    adaptive : bool or int (optional)
+        If True, or an integer stride, evaluate the grid of times with the
+        adaptive coarse-to-fine evaluation of `~astroplan.is_observable`.
+        Default is False.
+
+    chunk_size : int (optional)
+        Evaluate the constraints for at most ``chunk_size`` targets at a
+        time, and reduce them to windows before evaluating the next targets,
+        so that the memory used does not grow with the number of targets.
+        Default is 1000, or None to evaluate all targets at once.
+
+    Returns
+    -------
+    offsets : `~numpy.ndarray`
+        Array of integers of length ``len(targets) + 1``, with the index of
+        the first window of each target in ``starts`` and ``ends``
 
+    starts : `~astropy.time.Time`
+        Start times of the windows, sorted by target then by time
 
-def min_best_rescale(vals, min_val, max_val, less_than_min=1):
+    ends : `~astropy.time.Time`
+        End times of the windows, sorted by target then by time
+    """
+    if not hasattr(constraints, '__len__'):
+        constraints = [constraints]
+
+    times = time_grid_from_range(time_range,
+                                 time_resolution=time_grid_resolution)
+    targets = get_skycoord(targets)
+    if targets.isscalar:
+        targets = targets.reshape((1,))
+
+    stride = _adaptive_stride(adaptive, times)
+    n_bisections = int(np.ceil(np.log2(
+        (time_grid_resolution / precision).decompose().value)))
+    if chunk_size is None:
+        chunk_size = max(len(targets), 1)
+
+    start_targets, start_positions, end_positions = [], [], []
+    for start in range(0, len(targets), chunk_size):
+        windows = _window_positions(constraints, observer,
+                                    targets[start:start+chunk_size], times,
+                                    stride, time_grid_resolution,
+                                    n_bisections)
+        start_targets.append(windows[0] + start)
+        start_positions.append(windows[1])
+        end_positions.append(windows[2])
+    start_targets = np.concatenate(start_targets + [np.zeros(0, int)])
+    start_positions = np.concatenate(start_positions + [np.zeros(0)])
+    end_positions = np.concatenate(end_positions + [np.zeros(0)])
+
+    offsets = np.concatenate([[0], np.cumsum(np.bincount(
+        start_targets, minlength=len(targets)))])
+    starts = times[0] + start_positions * time_grid_resolution
+    ends = times[0] + end_positions * time_grid_resolution
+    return offsets, starts, ends
+
+
+def _window_positions(constraints, observer, targets, times, stride,
+                      time_grid_resolution, n_bisections):
+    """
+    Windows of `observability_windows` for one chunk of ``targets``.
+
+    Returns
+    -------
+    start_targets : `~numpy.ndarray`
+        Index of the target of each window, sorted by target then by time
+    start_positions, end_positions : `~numpy.ndarray`
+        Start and end of each window, as fractional indices into ``times``
+    """
+    if stride:
+        mask = _adaptive_constraint_mask(constraints, observer, targets,
+                                         times, stride)
+    else:
+        mask = _constraint_mask(constraints, observer, targets, times)
+
+    # a window starts at index i if the result changes from False at i - 1
+    # to True at i, and ends at index i if it changes from True at i - 1 to
+    # False at i, with False on both sides of the grid
+    change_targets, change_index = np.nonzero(mask[:, 1:] ^ mask[:, :-1])
+    change_index += 1
+    rises = mask[change_targets, change_index]
+    first = np.nonzero(mask[:, 0])[0]
+    last = np.nonzero(mask[:, -1])[0]
+    start_targets = np.concatenate([first, change_targets[rises]])
+    start_index = np.concatenate([np.zeros(len(first), int),
+                                  change_index[rises]])
+    end_targets = np.concatenate([change_targets[~rises], last])
+    end_index = np.concatenate([change_index[~rises],
+                                np.full(len(last), len(times), int)])
+    order = np.lexsort((start_index, start_targets))
+    start_targets, start_index = start_targets[order], start_index[order]
+    order = np.lexsort((end_index, end_targets))
+    end_targets, end_index = end_targets[order], end_index[order]
+
+    start_positions = start_index.astype(float)
+    end_positions = end_index - 1.0
+
+    # locate the changes inside the grid by bisection, between the grid
+    # indices before and after them
+    refined_starts = start_index > 0
+    refined_ends = end_index < len(times)
+    edge_targets = np.concatenate([start_targets[refined_starts],
+                                   end_targets[refined_ends]])
+    lower = np.concatenate([start_positions[refined_starts] - 1,
+                            end_positions[refined_ends]])
+    upper = lower + 1
+    lower_values = np.arange(len(edge_targets)) >= np.count_nonzero(
+        refined_starts)
+
+    if len(edge_targets):
+        edge_coords = targets[edge_targets]
+        for _ in range(max(n_bisections, 0)):
+            middle = (lower + upper) / 2
+            values = _paired_constraint_mask(
+                constraints, observer, edge_coords,
+                times[0] + middle * time_grid_resolution)
+            lower = np.where(values == lower_values, middle, lower)
+            upper = np.where(values == lower_values, upper, middle)
+
+    # windows start at the first time and end at the last time known to be
+    # observable
+    n_refined_starts = np.count_nonzero(refined_starts)
+    start_positions[refined_starts] = upper[:n_refined_starts]
+    end_positions[refined_ends] = lower[n_refined_starts:]
+    return start_targets, start_positions, end_positions
+
+
+def _plain_values(vals, min_val, max_val):
+    """
+    Values and bounds of `min_best_rescale` and `max_best_rescale` as plain
+    arrays and floats, in the unit of ``vals`` if it is a
+    `~astropy.units.Quantity`, e.g. altitudes as a
+    `~astropy.coordinates.Latitude`.
+    """
+    if isinstance(vals, u.Quantity):
+        unit = vals.unit
+        return (vals.value, u.Quantity(min_val).to(unit).value,
+                u.Quantity(max_val).to(unit).value)
+    return np.asarray(vals), min_val, max_val
+
+
+def min_best_rescale(vals, min_val, max_val, less_than_min=1, out=None):
     """
     rescales an input array ``vals`` to be a score (between zero and one),
     where the ``min_val`` goes to one, and the ``max_val`` goes to zero.
@@ -1246,6 +3067,10 @@ def min_best_rescale(vals, min_val, max_val, less_than_min=1):
         what is returned for ``vals`` below ``min_val``. (in some cases
         anything less than ``min_val`` should also return one,
         in some cases it should return zero)
+    out : `~numpy.ndarray` (optional)
+        floating point array in which the result is stored, which can be
+        ``vals`` itself if it is a plain array, to rescale the values in
+        place without allocating a new array
 
     Returns
     -------
@@ -1264,16 +3089,21 @@ def min_best_rescale(vals, min_val, max_val, less_than_min=1):
     >>> min_best_rescale(airmasses, 1, 2.25, less_than_min = 0)  # doctest: +FLOAT_CMP
     array([ 1. ,  0.6,  0.2,  0. , 0. ])
     """
-    rescaled = (vals - max_val) / (min_val - max_val)
+    vals, min_val, max_val = _plain_values(vals, min_val, max_val)
     below = vals < min_val
     above = vals > max_val
+    if out is None:
+        rescaled = (vals - max_val) / (min_val - max_val)
+    else:
+        rescaled = np.subtract(vals, max_val, out=out)
+        rescaled /= min_val - max_val
     rescaled[below] = less_than_min
     rescaled[above] = 0
 
     return rescaled
 
 
-def max_best_rescale(vals, min_val, max_val, greater_than_max=1):
+def max_best_rescale(vals, min_val, max_val, greater_than_max=1, out=None):
     """
     rescales an input array ``vals`` to be a score (between zero and one),
     where the ``max_val`` goes to one, and the ``min_val`` goes to zero.
@@ -1290,6 +3120,10 @@ def max_best_rescale(vals, min_val, max_val, greater_than_max=1):
         what is returned for ``vals`` above ``max_val``. (in some cases
         anything higher than ``max_val`` should also return one,
         in some cases it should return zero)
+    out : `~numpy.ndarray` (optional)
+        floating point array in which the result is stored, which can be
+        ``vals`` itself if it is a plain array, to rescale the values in
+        place without allocating a new array
 
     Returns
     -------
@@ -1309,9 +3143,14 @@ def max_best_rescale(vals, min_val, max_val, greater_than_max=1):
     >>> max_best_rescale(altitudes, 35, 60)  # doctest: +FLOAT_CMP
     array([ 0. , 0. , 0.2, 0.4, 0.8, 1. ])
     """
-    rescaled = (vals - min_val) / (max_val - min_val)
+    vals, min_val, max_val = _plain_values(vals, min_val, max_val)
     below = vals < min_val
     above = vals > max_val
+    if out is None:
+        rescaled = (vals - min_val) / (max_val - min_val)
+    else:
+        rescaled = np.subtract(vals, min_val, out=out)
+        rescaled /= max_val - min_val
     rescaled[below] = 0
     rescaled[above] = greater_than_max
 
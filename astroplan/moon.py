@@ -32,10 +32,29 @@ def moon_phase_angle(time, ephemeris=None):
     i : float
         Phase angle of the moon [radians]
     """
-    # TODO: cache these sun/moon SkyCoord objects
-
     sun = get_sun(time)
     moon = get_moon(time, ephemeris=ephemeris)
+    return _moon_phase_angle_from_coords(sun, moon)
+
+
+def _moon_phase_angle_from_coords(sun, moon):
+    """
+    Calculate lunar orbital phase in radians from the positions of the Sun
+    and the Moon, which must be in the same frame.
+
+    Parameters
+    ----------
+    sun : `~astropy.coordinates.SkyCoord`
+        Position of the Sun, with distance
+
+    moon : `~astropy.coordinates.SkyCoord`
+        Position of the Moon, with distance
+
+    Returns
+    -------
+    i : float
+        Phase angle of the moon [radians]
+    """
     elongation = sun.separation(moon)
     return np.arctan2(sun.distance*np.sin(elongation),
                       moon.distance - sun.distance*np.cos(elongation))
@@ -63,3 +82,26 @@ def moon_illumination(time, ephemeris=None):
     i = moon_phase_angle(time, ephemeris=ephemeris)
     k = (1 + np.cos(i))/2.0
     return k.value
+
+
+def _moon_illumination_from_coords(sun, moon):
+    """
+    Calculate fraction of the moon illuminated from the positions of the Sun
+    and the Moon, which must be in the same frame.
+
+    Parameters
+    ----------
+    sun : `~astropy.coordinates.SkyCoord`
+        Position of the Sun, with distance
+
+    moon : `~astropy.coordinates.SkyCoord`
+        Position of the Moon, with distance
+
+    Returns
+    -------
+    k : float
+        Fraction of moon illuminated
+    """
+    i = _moon_phase_angle_from_coords(sun, moon)
+    k = (1 + np.cos(i))/2.0
+    return k.value
@@ -14,10 +14,18 @@ import astropy.units as u
 from astropy.time import Time
 import numpy as np
 import pytz
+try:
+    import erfa
+except ImportError:
+    # astropy < 4.2 bundles its own copy of ERFA
+    from astropy import _erfa as erfa
 
 # Package
 from .exceptions import TargetNeverUpWarning, TargetAlwaysUpWarning
 from .moon import moon_illumination, moon_phase_angle
+from .cache import (ObserverCache, EphemerisDiskCache,
+                    DEFAULT_CACHE_MAX_BYTES)
+from .profiling import _profiled
 from .target import get_skycoord, SunFlag, MoonFlag
 
 
@@ -114,7 +122,9 @@ class Observer(object):
     @u.quantity_input(elevation=u.m)
     def __init__(self, location=None, timezone='UTC', name=None, latitude=None,
                  longitude=None, elevation=0*u.m, pressure=None,
-                 relative_humidity=None, temperature=None, description=None):
+                 relative_humidity=None, temperature=None, description=None,
+                 cache_max_bytes=DEFAULT_CACHE_MAX_BYTES,
+                 ephemeris_cache=None):
         """
         Parameters
         ----------
@@ -152,6 +162,18 @@ class Observer(object):
         description : str (optional)
             A short description of the telescope, observatory or observing
             location.
+
+        cache_max_bytes : int (optional)
+            Memory budget, in bytes, of the cache of intermediate results
+            (see `~astroplan.ObserverCache`) used when evaluating
+            constraints for this observer. Defaults to 256 MiB.
+
+        ephemeris_cache : `~astroplan.EphemerisDiskCache` or str (optional)
+            Persistent cache, or directory of the cache, in which the
+            positions of the Sun and Moon, the sidereal times and the lunar
+            illumination computed on grids of times are stored on disk, and
+            from which they are read back instead of being recomputed.
+            Defaults to no persistent cache.
         """
 
         self.name = name
@@ -186,6 +208,12 @@ class Observer(object):
             raise TypeError('timezone keyword should be a string, or an '
                             'instance of datetime.tzinfo')
 
+        self.cache = ObserverCache(max_bytes=cache_max_bytes)
+        if ephemeris_cache is not None and not isinstance(ephemeris_cache,
+                                                          EphemerisDiskCache):
+            ephemeris_cache = EphemerisDiskCache(ephemeris_cache)
+        self.ephemeris_cache = ephemeris_cache
+
     def __repr__(self):
         """
         String representation of the `~astroplan.Observer` object.
@@ -399,7 +427,9 @@ class Observer(object):
                              .format(time.shape, target.shape))
         return time, target
 
-    def altaz(self, time, target=None, obswl=None, grid_times_targets=False):
+    @_profiled('Observer.altaz')
+    def altaz(self, time, target=None, obswl=None, grid_times_targets=False,
+              pressure=None):
         """
         Get an `~astropy.coordinates.AltAz` frame or coordinate.
 
@@ -429,6 +459,12 @@ class Observer(object):
             broadcasting the shapes together using standard numpy
             rules. Useful for grid searches for rise/set times etc.
 
+        pressure : `~astropy.units.Quantity` (optional)
+            The ambient pressure for this calculation only, for instance zero
+            to ignore atmospheric refraction. Defaults to the ``pressure`` of
+            this observer, which is left unchanged, so that one observer can
+            be used from several threads at once.
+
         Returns
         -------
         `~astropy.coordinates.AltAz`
@@ -461,8 +497,11 @@ class Observer(object):
         if target is not None:
             time, target = self._preprocess_inputs(time, target, grid_times_targets)
 
+        if pressure is None:
+            pressure = self.pressure
+
         altaz_frame = AltAz(location=self.location, obstime=time,
-                            pressure=self.pressure, obswl=obswl,
+                            pressure=pressure, obswl=obswl,
                             temperature=self.temperature,
                             relative_humidity=self.relative_humidity)
         if target is None:
@@ -471,6 +510,7 @@ class Observer(object):
         else:
             return target.transform_to(altaz_frame)
 
+    @_profiled('Observer.parallactic_angle')
     def parallactic_angle(self, time, target, grid_times_targets=False):
         """
         Calculate the parallactic angle.
@@ -658,16 +698,18 @@ class Observer(object):
         crossing_jd[np.isnan(crossing_jd)] = u.d*MAGIC_TIME.jd
         return np.squeeze(Time(crossing_jd, format='jd'))
 
-    def _altitude_trig(self, LST, target, grid_times_targets=False):
+    @_profiled('Observer._altitude_trig')
+    def _altitude_trig(self, LST, target, grid_times_targets=False,
+                       refraction=False, obswl=None):
         """
         Calculate the altitude of ``target`` at local sidereal times ``LST``.
 
         This method provides a factor of ~3 speed up over calling `altaz`, and
-        inherently does *not* take the atmosphere into account.
+        by default does *not* take the atmosphere into account.
 
         Parameters
         ----------
-        LST : `~astropy.time.Time`
+        LST : `~astropy.coordinates.Longitude`
             Local sidereal times (array)
 
         target : {`~astropy.coordinates.SkyCoord`, `FixedTarget`} or similar
@@ -679,19 +721,84 @@ class Observer(object):
             shaped result. Otherwise, we rely on broadcasting the shapes together
             using standard numpy rules. Useful for grid searches for rise/set times etc.
 
+        refraction : bool (optional)
+            If True, add the atmospheric refraction for the ``pressure``,
+            ``temperature`` and ``relative_humidity`` of this observer (see
+            `_refraction`).
+
+        obswl : `~astropy.units.Quantity` (optional)
+            Wavelength of the observation used in the refraction calculation.
+
         Returns
         -------
         alt : `~astropy.unit.Quantity`
             Array of altitudes
         """
-        LST, target = self._preprocess_inputs(LST, target, grid_times_targets)
-        alt = np.arcsin(np.sin(self.location.lat.radian) *
-                        np.sin(target.dec) +
-                        np.cos(self.location.lat.radian) *
-                        np.cos(target.dec) *
+        target = get_skycoord(target)
+        if grid_times_targets:
+            if target.isscalar:
+                target = SkyCoord(np.tile(target, 1))[:, np.newaxis]
+            else:
+                while target.ndim <= LST.ndim:
+                    target = target[:, np.newaxis]
+        elif not self._is_broadcastable(target.shape, LST.shape):
+            raise ValueError('LST and Target arguments cannot be broadcast '
+                             'against each other with shapes {} and {}'
+                             .format(LST.shape, target.shape))
+
+        lat = self.location.lat.radian
+        dec = target.dec.radian
+        alt = np.arcsin(np.sin(lat) * np.sin(dec) +
+                        np.cos(lat) * np.cos(dec) *
                         np.cos(LST.radian - target.ra.radian))
-        return alt
+        if refraction:
+            alt = self._refraction(alt, obswl=obswl)
+        return alt * u.rad
+
+    def _refraction(self, altitude, obswl=None):
+        """
+        Apply atmospheric refraction to geometric altitudes.
+
+        This uses the same model as the `~astropy.coordinates.AltAz` frame:
+        the ``A tan(z) + B tan^3(z)`` refraction coefficients from
+        ``erfa.refco`` for the ``pressure``, ``temperature`` and
+        ``relative_humidity`` of this observer, with the Newton-Raphson
+        correction and low-altitude cut-off of ``erfa.atioq``.
+
+        Parameters
+        ----------
+        altitude : `~numpy.ndarray`
+            Geometric (vacuum) altitudes in radians.
+
+        obswl : `~astropy.units.Quantity` (optional)
+            Wavelength of the observation. Defaults to 1 micron.
 
+        Returns
+        -------
+        altitude : `~numpy.ndarray`
+            Observed (refracted) altitudes in radians.
+        """
+        if self.pressure is None or self.pressure.value == 0:
+            return altitude
+
+        temperature = (0 if self.temperature is None else
+                       self.temperature.to(u.deg_C, u.temperature()).value)
+        relative_humidity = (0 if self.relative_humidity is None else
+                             self.relative_humidity)
+        wavelength = 1 if obswl is None else obswl.to(u.micron).value
+        refa, refb = erfa.refco(self.pressure.to(u.hPa).value, temperature,
+                                relative_humidity, wavelength)
+
+        sin_alt = np.sin(altitude)
+        cos_alt = np.maximum(np.cos(altitude), 1e-6)
+        z = np.maximum(sin_alt, 0.05)
+        tan_z = cos_alt / z
+        w = refb * tan_z**2
+        delta = (refa + w) * tan_z / (1 + (refa + 3 * w) / z**2)
+        return np.arcsin(np.clip((1 - delta**2 / 2) * sin_alt +
+                                 delta * cos_alt, -1, 1))
+
+    @_profiled('Observer._calc_riseset')
     def _calc_riseset(self, time, target, prev_next, rise_set, horizon,
                       N=150, grid_times_targets=False):
         """
@@ -766,6 +873,7 @@ class Observer(object):
         return self._two_point_interp(jd1, jd2, al1, al2,
                                       horizon=horizon)
 
+    @_profiled('Observer._calc_transit')
     def _calc_transit(self, time, target, prev_next, antitransit=False,
                       N=150, grid_times_targets=False):
         """
@@ -1449,6 +1557,7 @@ class Observer(object):
         """
         return self.target_set_time(time, MoonFlag, which, horizon)
 
+    @_profiled('Observer.moon_illumination')
     def moon_illumination(self, time):
         """
         Calculate the illuminated fraction of the moon.
@@ -1520,6 +1629,7 @@ class Observer(object):
 
         return moon_phase_angle(time)
 
+    @_profiled('Observer.moon_altaz')
     def moon_altaz(self, time, ephemeris=None):
         """
         Returns the position of the moon in alt/az.
@@ -1559,9 +1669,14 @@ class Observer(object):
         if not isinstance(time, Time):
             time = Time(time)
 
+        if self.ephemeris_cache is not None:
+            from .constraints import EphemerisGrid
+            return EphemerisGrid(time, self, ephemeris=ephemeris).moon_altaz()
+
         moon = get_moon(time, location=self.location, ephemeris=ephemeris)
         return self.altaz(time, moon)
 
+    @_profiled('Observer.sun_altaz')
     def sun_altaz(self, time):
         """
         Returns the position of the Sun in alt/az.
@@ -1588,6 +1703,10 @@ class Observer(object):
         if not isinstance(time, Time):
             time = Time(time)
 
+        if self.ephemeris_cache is not None:
+            from .constraints import EphemerisGrid
+            return EphemerisGrid(time, self).sun_altaz()
+
         sun = get_sun(time)
         return self.altaz(time, sun)
 
@@ -1705,6 +1824,7 @@ class Observer(object):
         else:
             return solar_altitude < horizon
 
+    @_profiled('Observer.local_sidereal_time')
     def local_sidereal_time(self, time, kind='apparent', model=None):
         """
         Convert ``time`` to local sidereal time for observer.
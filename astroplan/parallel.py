@@ -0,0 +1,120 @@
+# Licensed under a 3-clause BSD style license - see LICENSE.rst
+"""
+Evaluation of constraints on shards of targets in a pool of worker
+processes.
+
+The observer, the constraints and the full sequence of targets are sent to
+each worker once, when the worker starts. Each task is then only the range
+of targets of a shard, and the workers write their results directly into an
+output array in shared memory, so that large results are not pickled back
+to the parent process.
+"""
+
+from __future__ import (absolute_import, division, print_function,
+                        unicode_literals)
+
+# Standard library
+import ctypes
+import multiprocessing
+from multiprocessing.sharedctypes import RawArray
+
+# Third-party
+import numpy as np
+
+__all__ = []
+
+# State of a worker process, set once by _init_worker
+_worker_state = {}
+
+
+def _n_workers(n_jobs):
+    """
+    Number of worker processes for the ``n_jobs`` argument of the
+    observability functions: all CPUs for negative values, and no workers
+    (i.e. serial evaluation) for None or 1.
+    """
+    if n_jobs is None:
+        return 0
+    n_jobs = int(n_jobs)
+    if n_jobs < 0:
+        n_jobs = max(multiprocessing.cpu_count() + 1 + n_jobs, 1)
+    return n_jobs if n_jobs > 1 else 0
+
+
+def _init_worker(function, constraints, observer, items, output, shape,
+                 dtype, kwargs):
+    _worker_state.update(function=function, constraints=constraints,
+                         observer=observer, items=items, output=output,
+                         shape=shape, dtype=dtype, kwargs=kwargs)
+
+
+def _run_shard(bounds):
+    start, stop = bounds
+    state = _worker_state
+    output = np.frombuffer(state['output'],
+                           dtype=state['dtype']).reshape(state['shape'])
+    output[start:stop] = state['function'](state['constraints'],
+                                           state['observer'],
+                                           state['items'][start:stop],
+                                           **state['kwargs'])
+
+
+def _map_shards(function, constraints, observer, items, shape, dtype,
+                n_jobs, shard_size=None, **kwargs):
+    """
+    Evaluate ``function`` on shards of ``items`` in a pool of ``n_jobs``
+    worker processes.
+
+    Parameters
+    ----------
+    function : callable
+        Module-level function called as ``function(constraints, observer,
+        items[start:stop], **kwargs)``, which returns the rows
+        ``start:stop`` of the output array
+    constraints : list of `~astroplan.constraints.Constraint`
+        Observational constraints
+    observer : `~astroplan.Observer`
+        The observer who has constraints ``constraints``
+    items : sequence
+        Targets, or other objects such as observing blocks, along the first
+        axis of the output array. Must support slicing.
+    shape : tuple
+        Shape of the output array
+    dtype : `~numpy.dtype`
+        Data type of the output array
+    n_jobs : int
+        Number of worker processes, or a negative number to use all CPUs
+    shard_size : int (optional)
+        Number of items per shard. Default is to split the items into four
+        shards per worker.
+    kwargs
+        Additional keyword arguments of ``function``
+
+    Returns
+    -------
+    output : `~numpy.ndarray`
+        Array of shape ``shape``, backed by shared memory
+    """
+    dtype = np.dtype(dtype)
+    n_workers = max(_n_workers(n_jobs), 1)
+    n_items = shape[0]
+    if not n_items:
+        return np.zeros(shape, dtype=dtype)
+
+    if shard_size is None:
+        shard_size = int(np.ceil(n_items / (4 * n_workers)))
+    bounds = [(start, min(start + shard_size, n_items))
+              for start in range(0, n_items, shard_size)]
+
+    output = RawArray(ctypes.c_byte, int(np.prod(shape)) * dtype.itemsize)
+    pool = multiprocessing.Pool(
+        min(n_workers, len(bounds)), initializer=_init_worker,
+        initargs=(function, constraints, observer, items, output, shape,
+                  dtype, kwargs))
+    try:
+        pool.map(_run_shard, bounds)
+    finally:
+        pool.close()
+        pool.join()
+
+    return np.frombuffer(output, dtype=dtype).reshape(shape)
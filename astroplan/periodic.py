@@ -47,8 +47,30 @@ class PeriodicEvent(object):
         phase_array : `~numpy.ndarray`
             Phase at each ``time``, on range [0, 1)
         """
-        return ((time - self.epoch).to(u.day).value %
-                self.period.to(u.day).value) / self.period.to(u.day).value
+        return self._phase_from_jd(*self._two_part_jd(time))
+
+    def _two_part_jd(self, time):
+        """
+        Two-part Julian Dates of ``time`` in the time scale in which it is
+        subtracted from the epoch: the scale of the epoch, or TAI for a UTC
+        epoch, as in the subtraction of `~astropy.time.Time` objects.
+        """
+        scale = 'tai' if self.epoch.scale == 'utc' else self.epoch.scale
+        if time.scale != scale:
+            time = getattr(time, scale)
+        return time.jd1, time.jd2
+
+    def _phase_from_jd(self, jd1, jd2):
+        """
+        Phase at the two-part Julian Dates ``jd1`` and ``jd2`` from
+        `_two_part_jd`, computed without intermediate `~astropy.time.Time`
+        or `~astropy.units.Quantity` objects.
+        """
+        epoch_jd1, epoch_jd2 = self._two_part_jd(self.epoch)
+        period = self.period.to(u.day).value
+        # subtract the large and small parts separately to preserve precision
+        days = (jd1 - epoch_jd1) + (jd2 - epoch_jd2)
+        return (days % period) / period
 
 
 class EclipsingSystem(PeriodicEvent):
@@ -116,9 +138,11 @@ class EclipsingSystem(PeriodicEvent):
         in_eclipse : `~numpy.ndarray` or bool
             `True` if ``time`` is during primary eclipse
         """
-        phases = self.phase(time)
-        return ((phases < float(self.duration/self.period)/2) |
-                (phases > 1 - float(self.duration/self.period)/2))
+        return self._in_primary_eclipse(self.phase(time))
+
+    def _in_primary_eclipse(self, phases):
+        half_width = float(self.duration/self.period)/2
+        return (phases < half_width) | (phases > 1 - half_width)
 
     def in_secondary_eclipse(self, time):
         r"""
@@ -152,14 +176,17 @@ class EclipsingSystem(PeriodicEvent):
         ----------
         .. [1] Winn (2010) https://arxiv.org/abs/1001.2010
         """
+        return self._in_secondary_eclipse(self.phase(time))
+
+    def _in_secondary_eclipse(self, phases):
         if self.eccentricity < 1e-5:
             secondary_eclipse_phase = 0.5
         else:
             secondary_eclipse_phase = 0.5 * (1 + 4/np.pi * self.eccentricity *
                                              np.cos(self.argument_of_periapsis))
-        phases = self.phase(time)
-        return ((phases < secondary_eclipse_phase + float(self.duration/self.period)/2) &
-                (phases > secondary_eclipse_phase - float(self.duration/self.period)/2))
+        half_width = float(self.duration/self.period)/2
+        return ((phases < secondary_eclipse_phase + half_width) &
+                (phases > secondary_eclipse_phase - half_width))
 
     def out_of_eclipse(self, time):
         """
@@ -178,8 +205,9 @@ class EclipsingSystem(PeriodicEvent):
         in_eclipse : `~numpy.ndarray` or bool
             `True` if ``time`` is not during primary or secondary eclipse
         """
-        return np.logical_not(np.logical_or(self.in_primary_eclipse(time),
-                                            self.in_secondary_eclipse(time)))
+        phases = self.phase(time)
+        return np.logical_not(np.logical_or(self._in_primary_eclipse(phases),
+                                            self._in_secondary_eclipse(phases)))
 
     def next_primary_eclipse_time(self, time, n_eclipses=1):
         """
@@ -0,0 +1,164 @@
+# Licensed under a 3-clause BSD style license - see LICENSE.rst
+"""
+Opt-in instrumentation of the evaluation of constraints and of the
+`~astroplan.Observer` methods.
+
+Instrumentation is only active inside a `Profiler` context. Outside of one,
+each instrumented call only checks whether any profiler is active.
+"""
+
+from __future__ import (absolute_import, division, print_function,
+                        unicode_literals)
+
+# Standard library
+import functools
+import threading
+from timeit import default_timer
+
+# Third-party
+import numpy as np
+
+__all__ = ["Profiler"]
+
+# Profilers of the active `Profiler` contexts
+_profilers = []
+
+_COLUMNS = ['calls', 'time', 'cells', 'hits', 'misses']
+
+
+def _record(name, elapsed=0., cells=0, hit=None):
+    """
+    Record a call, or a cache lookup if ``hit`` is not `None`, in all the
+    active profilers.
+    """
+    for profiler in list(_profilers):
+        profiler._record(name, elapsed, cells, hit)
+
+
+def _size(result):
+    """
+    Number of cells of the result of a computation, e.g. an array,
+    coordinates or times.
+    """
+    shape = getattr(result, 'shape', None)
+    if shape is None:
+        return int(np.size(result))
+    return int(np.prod(shape))
+
+
+def _profiled(name):
+    """
+    Decorator which records the wall time, the number of calls and the size
+    of the results of a function under ``name`` while a `Profiler` is
+    active.
+    """
+    def decorator(function):
+        @functools.wraps(function)
+        def wrapper(*args, **kwargs):
+            if not _profilers:
+                return function(*args, **kwargs)
+
+            start = default_timer()
+            result = function(*args, **kwargs)
+            _record(name, default_timer() - start, _size(result))
+            return result
+        return wrapper
+    return decorator
+
+
+class Profiler(object):
+    """
+    Records the wall time, number of calls, grid sizes and cache hits and
+    misses of constraints, `~astroplan.Observer` methods and lookups in the
+    `~astroplan.ObserverCache` while it is active.
+
+    The statistics are recorded under the name of the constraint class, e.g.
+    ``'AltitudeConstraint'``, where cache hits and misses are lookups of
+    memoised results, of the observer method, e.g. ``'Observer.altaz'``, or
+    of the type of cached result, e.g. ``'cache:altaz'``. The ``'cells'``
+    are the numbers of elements of the computed results.
+
+    Examples
+    --------
+    >>> from astroplan import (Observer, AltitudeConstraint, is_observable,
+    ...                        Profiler)
+    >>> from astropy.coordinates import SkyCoord
+    >>> from astropy.time import Time
+    >>> import astropy.units as u
+    >>> subaru = Observer.at_site("Subaru")
+    >>> target = SkyCoord(279.23*u.deg, 38.78*u.deg)
+    >>> times = Time("2015-08-01 06:00") + [0, 1, 2]*u.hour
+    >>> with Profiler() as profiler: # doctest: +SKIP
+    ...     is_observable(AltitudeConstraint(min=30*u.deg), subaru, target,
+    ...                   times=times)
+    >>> profiler.stats['AltitudeConstraint']['calls'] # doctest: +SKIP
+    1
+    """
+
+    def __init__(self):
+        self._stats = {}
+        self._lock = threading.Lock()
+
+    def __enter__(self):
+        _profilers.append(self)
+        return self
+
+    def __exit__(self, *exc_info):
+        _profilers.remove(self)
+
+    def _record(self, name, elapsed, cells, hit):
+        with self._lock:
+            stats = self._stats.setdefault(name, dict.fromkeys(_COLUMNS, 0))
+            if hit is None:
+                stats['calls'] += 1
+                stats['time'] += elapsed
+                stats['cells'] += cells
+            elif hit:
+                stats['hits'] += 1
+            else:
+                stats['misses'] += 1
+
+    def reset(self):
+        """
+        Remove all recorded statistics.
+        """
+        with self._lock:
+            self._stats.clear()
+
+    @property
+    def stats(self):
+        """
+        Recorded statistics.
+
+        Returns
+        -------
+        stats : dict
+            Dictionary with a dictionary for each recorded name, with the
+            number of ``'calls'``, their total wall ``'time'`` in seconds,
+            the total number of ``'cells'`` computed, and the number of cache
+            ``'hits'`` and ``'misses'``.
+        """
+        with self._lock:
+            return dict((name, dict(stats))
+                        for name, stats in self._stats.items())
+
+    def to_table(self):
+        """
+        Recorded statistics as a table.
+
+        Returns
+        -------
+        table : `~astropy.table.Table`
+            Table with a ``'name'`` column and a column for each statistic
+            of `stats`, sorted by decreasing time.
+        """
+        from astropy.table import Table
+
+        stats = self.stats
+        names = sorted(stats, key=lambda name: -stats[name]['time'])
+        table = Table()
+        table['name'] = names
+        for column in _COLUMNS:
+            table[column] = [stats[name][column] for name in names]
+        table['time'].unit = 'second'
+        return table
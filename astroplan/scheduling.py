@@ -17,6 +17,7 @@ from astropy.table import Table
 
 from .utils import time_grid_from_range, stride_array
 from .constraints import AltitudeConstraint
+from .parallel import _map_shards, _n_workers
 from .target import get_skycoord
 
 __all__ = ['ObservingBlock', 'TransitionBlock', 'Schedule', 'Slot',
@@ -94,6 +95,28 @@ class ObservingBlock(object):
         return ob
 
 
+def _score_blocks(global_constraints, observer, blocks, times, targets=None,
+                  dtype=float):
+    """
+    Score array of ``blocks`` at ``times``, with the constraints of each
+    block and ``global_constraints``.
+    """
+    if targets is None:
+        targets = get_skycoord([block.target for block in blocks])
+    score_array = np.ones((len(blocks), len(times)), dtype=dtype)
+    for i, block in enumerate(blocks):
+        # TODO: change the default constraints from None to []
+        if block.constraints:
+            for constraint in block.constraints:
+                applied_score = constraint(observer, block.target,
+                                           times=times)
+                score_array[i] *= applied_score
+    for constraint in global_constraints:
+        score_array *= constraint(observer, targets, times,
+                                  grid_times_targets=True)
+    return score_array
+
+
 class Scorer(object):
     """
     Returns scores and score arrays from the evaluation of constraints on
@@ -119,7 +142,8 @@ class Scorer(object):
         self.global_constraints = global_constraints
         self.targets = get_skycoord([block.target for block in self.blocks])
 
-    def create_score_array(self, time_resolution=1*u.minute):
+    def create_score_array(self, time_resolution=1*u.minute, n_jobs=None,
+                           dtype=float):
         """
         this makes a score array over the entire schedule for all of the
         blocks and each `~astroplan.Constraint` in the .constraints of
@@ -129,6 +153,14 @@ class Scorer(object):
         ----------
         time_resolution : `~astropy.units.Quantity`
             the time between each scored time
+        n_jobs : int (optional)
+            number of worker processes between which the blocks are shared,
+            or a negative number to use all CPUs. Default is None, to score
+            the blocks in this process.
+        dtype : `~numpy.dtype` (optional)
+            floating point type of the score array. Single precision
+            (``np.float32``) halves the memory used by the array, and is
+            precise enough for scheduling. Default is double precision.
 
         Returns
         -------
@@ -138,18 +170,14 @@ class Scorer(object):
         start = self.schedule.start_time
         end = self.schedule.end_time
         times = time_grid_from_range((start, end), time_resolution)
-        score_array = np.ones((len(self.blocks), len(times)))
-        for i, block in enumerate(self.blocks):
-            # TODO: change the default constraints from None to []
-            if block.constraints:
-                for constraint in block.constraints:
-                    applied_score = constraint(self.observer, block.target,
-                                               times=times)
-                    score_array[i] *= applied_score
-        for constraint in self.global_constraints:
-            score_array *= constraint(self.observer, self.targets, times,
-                                      grid_times_targets=True)
-        return score_array
+        if _n_workers(n_jobs):
+            return _map_shards(_score_blocks, self.global_constraints,
+                               self.observer, self.blocks,
+                               (len(self.blocks), len(times)), dtype, n_jobs,
+                               times=times)
+        return _score_blocks(self.global_constraints, self.observer,
+                             self.blocks, times, targets=self.targets,
+                             dtype=dtype)
 
     @classmethod
     def from_start_end(cls, blocks, observer, start_time, end_time,
@@ -742,7 +770,8 @@ class PriorityScheduler(Scheduler):
         # generate the score arrays for all of the blocks
         scorer = Scorer(blocks, self.observer, self.schedule,
                         global_constraints=self.constraints)
-        score_array = scorer.create_score_array(time_resolution)
+        score_array = scorer.create_score_array(time_resolution,
+                                                dtype=np.float32)
 
         # Sort the list of blocks by priority
         sorted_indices = np.argsort(_block_priorities)
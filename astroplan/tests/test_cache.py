@@ -0,0 +1,174 @@
+# Licensed under a 3-clause BSD style license - see LICENSE.rst
+from __future__ import (absolute_import, division, print_function,
+                        unicode_literals)
+
+import pickle
+from multiprocessing.pool import ThreadPool
+
+import numpy as np
+import astropy.units as u
+from astropy.time import Time
+from astropy.coordinates import SkyCoord, solar_system_ephemeris
+
+from ..cache import ObserverCache, EphemerisDiskCache
+from ..observer import Observer
+from ..constraints import (AltitudeConstraint, AtNightConstraint,
+                           MoonSeparationConstraint,
+                           MoonIlluminationConstraint, EphemerisGrid)
+
+
+def test_lru_eviction_by_bytes():
+    cache = ObserverCache(max_bytes=3 * 800)
+    for i in range(3):
+        cache.set(('array', i), np.zeros(100))
+    assert len(cache) == 3
+    assert cache.current_bytes == 2400
+
+    # touch the oldest entry so that ('array', 1) is least recently used
+    assert cache.get(('array', 0)) is not None
+    cache.set(('array', 3), np.zeros(100))
+
+    assert ('array', 1) not in cache
+    assert ('array', 0) in cache
+    assert cache.evictions == 1
+    assert cache.current_bytes <= cache.max_bytes
+
+
+def test_broadcast_arrays_count_their_buffer():
+    cache = ObserverCache()
+    cache.set('broadcast', np.broadcast_to(np.zeros((100, 1)), (100, 50)))
+    assert cache.current_bytes == 800
+
+
+def test_oversized_results_are_not_cached():
+    cache = ObserverCache(max_bytes=100)
+    cache.set('big', np.zeros(100))
+    assert 'big' not in cache
+    assert cache.current_bytes == 0
+
+
+def test_stats_and_clear():
+    cache = ObserverCache()
+    assert cache.get('missing') is None
+    cache.set('present', np.arange(10))
+    assert cache.get('present') is not None
+
+    stats = cache.stats
+    assert stats['hits'] == 1
+    assert stats['misses'] == 1
+    assert stats['entries'] == 1
+
+    cache.clear()
+    assert len(cache) == 0
+    assert cache.current_bytes == 0
+    assert cache.stats['hits'] == 1
+
+    cache.reset_stats()
+    assert cache.hits == cache.misses == cache.evictions == 0
+
+
+def test_observer_cache_used_by_constraints():
+    subaru = Observer.at_site("Subaru", cache_max_bytes=10*1024**2)
+    assert subaru.cache.max_bytes == 10*1024**2
+
+    times = Time('2015-08-01 06:00') + np.arange(10) * u.hour
+    targets = [SkyCoord(279.23*u.deg, 38.78*u.deg),
+               SkyCoord(78.63*u.deg, -8.20*u.deg)]
+    constraints = [AltitudeConstraint(min=30*u.deg), AtNightConstraint()]
+
+    for constraint in constraints:
+        constraint(subaru, targets, times, grid_times_targets=True)
+    n_misses = subaru.cache.misses
+    assert n_misses > 0
+    assert subaru.cache.hits == 0
+
+    for constraint in constraints:
+        constraint(subaru, targets, times, grid_times_targets=True)
+    assert subaru.cache.misses == n_misses
+    assert subaru.cache.hits == len(constraints)
+    assert 0 < subaru.cache.current_bytes <= subaru.cache.max_bytes
+
+
+def test_pickle():
+    cache = ObserverCache(max_bytes=1000)
+    cache.set('present', np.arange(10))
+    restored = pickle.loads(pickle.dumps(cache))
+    # the cached results are not pickled
+    assert len(restored) == 0 and restored.current_bytes == 0
+    assert restored.max_bytes == 1000
+    restored.set('new', np.arange(5))
+    assert 'new' in restored
+    assert 'present' in cache
+
+    # nor with an observer
+    subaru = Observer.at_site("Subaru")
+    subaru.cache.set('present', np.zeros(100000))
+    assert len(pickle.dumps(subaru)) < 100000
+
+
+def test_concurrent_use_from_threads():
+    cache = ObserverCache(max_bytes=20 * 80)
+
+    def use(i):
+        for j in range(200):
+            cache.set((i, j % 30), np.zeros(10))
+            cache.get((i, (j - 1) % 30))
+
+    pool = ThreadPool(8)
+    pool.map(use, range(8))
+    pool.close()
+    pool.join()
+    assert len(cache) <= 20
+    assert cache.current_bytes == 80 * len(cache)
+
+
+def test_ephemeris_disk_cache(tmpdir):
+    disk_cache = EphemerisDiskCache(str(tmpdir.join('ephemerides')))
+    location = Observer.at_site("Subaru").location
+    times = Time('2015-08-01 06:00') + np.arange(10) * u.hour
+
+    assert disk_cache.get(location, times, 'values') is None
+    disk_cache.set(location, times, 'values', np.arange(10.))
+    values = disk_cache.get(location, times, 'values')
+    assert isinstance(values, np.memmap)
+    assert np.all(values == np.arange(10.))
+    assert disk_cache.get(location, times + 1*u.s, 'values') is None
+    assert disk_cache.get(location, times, 'other') is None
+
+    disk_cache.clear()
+    assert disk_cache.get(location, times, 'values') is None
+
+
+def test_ephemerides_read_from_disk(tmpdir):
+    directory = str(tmpdir)
+    times = Time('2015-08-01 06:00') + np.arange(10) * u.hour
+    targets = [SkyCoord(279.23*u.deg, 38.78*u.deg),
+               SkyCoord(78.63*u.deg, -8.20*u.deg)]
+    constraints = [AtNightConstraint.twilight_civil(),
+                   MoonSeparationConstraint(min=30*u.deg),
+                   MoonIlluminationConstraint(max=0.5)]
+
+    subaru = Observer.at_site("Subaru", ephemeris_cache=directory)
+    computed = [constraint(subaru, targets, times, grid_times_targets=True)
+                for constraint in constraints]
+    sun_altaz = subaru.sun_altaz(times)
+    n_files = len(tmpdir.listdir())
+    assert n_files > 0
+
+    # a new observer at the same site reads the ephemerides from disk
+    subaru = Observer.at_site("Subaru", ephemeris_cache=directory)
+    read = [constraint(subaru, targets, times, grid_times_targets=True)
+            for constraint in constraints]
+    assert len(tmpdir.listdir()) == n_files
+    for computed_result, read_result in zip(computed, read):
+        assert np.all(computed_result == read_result)
+    assert np.all(np.abs(subaru.sun_altaz(times).alt - sun_altaz.alt) <
+                  1e-6*u.arcsec)
+    assert np.all(np.abs(EphemerisGrid(times, subaru).moon.separation(
+        EphemerisGrid(times, Observer.at_site("Subaru")).moon)) <
+                  1e-6*u.arcsec)
+
+    # the ephemerides are stored under the ephemeris set at run time
+    ephemeris = solar_system_ephemeris.get()
+    assert [key for key, value in subaru.cache.items()
+            if key[:3] == ('ephemeris', 'moon', ephemeris)]
@@ -1,8 +1,10 @@
 from __future__ import (absolute_import, division, print_function,
                         unicode_literals)
 import datetime as dt
+from multiprocessing.pool import ThreadPool
 
 import numpy as np
+import pytz
 import astropy.units as u
 from astropy.time import Time
 from astropy.coordinates import Galactic, SkyCoord, get_sun, get_moon
@@ -20,7 +22,9 @@ from ..constraints import (AltitudeConstraint, AirmassConstraint, AtNightConstra
                            TimeConstraint, LocalTimeConstraint, months_observable,
                            max_best_rescale, min_best_rescale, PhaseConstraint,
                            PrimaryEclipseConstraint, SecondaryEclipseConstraint,
-                           is_event_observable)
+                           is_event_observable, _make_cache_key, _get_altaz,
+                           EphemerisGrid, observability_windows,
+                           iter_observability_table, event_observability_table)
 from ..periodic import EclipsingSystem
 
 APY_LT104 = not minversion('astropy', '1.0.4')
@@ -285,6 +289,35 @@ def test_local_time_constraint_hawaii_tz():
     assert is_constraint_met is np.bool_(True)
 
 
+def test_local_time_constraint_vectorised():
+    subaru = Observer.at_site("Subaru")
+    times = Time("2016-03-12 00:00") + np.arange(0, 2*24*3600, 20.3)*u.s
+
+    for min_time, max_time in [(dt.time(23, 50), dt.time(4, 8)),
+                               (dt.time(3, 8), dt.time(5, 35, 0, 500)),
+                               (None, dt.time(1, 2, 3)),
+                               (dt.time(22), None)]:
+        constraint = LocalTimeConstraint(min=min_time, max=max_time)
+        min_time = min_time or dt.time(0, 0, 0)
+        max_time = max_time or dt.time(23, 59, 59)
+        if min_time < max_time:
+            expected = [min_time <= t.time() <= max_time
+                        for t in times.datetime]
+        else:
+            expected = [(t.time() >= min_time) or (t.time() <= max_time)
+                        for t in times.datetime]
+        assert np.all(constraint(subaru, None, times=times) == expected)
+
+    # as before, the clock times of time zone aware limits are compared with
+    # the times of day in UTC
+    timezone = pytz.timezone("US/Pacific")
+    min_time = dt.time(1, 30, tzinfo=timezone)
+    max_time = dt.time(3, 30, tzinfo=timezone)
+    constraint = LocalTimeConstraint(min=min_time, max=max_time)
+    expected = [min_time <= t.time() <= max_time for t in times.datetime]
+    assert np.all(constraint(subaru, None, times=times) == expected)
+
+
 def test_docs_example():
     # Test the example in astroplan/docs/tutorials/constraints.rst
     target_table_string = """# name ra_degrees dec_degrees
@@ -383,6 +416,45 @@ def test_months_observable():
     assert months == should_be
 
 
+@pytest.mark.parametrize('altitude_constraint',
+                         [AltitudeConstraint(min=50*u.deg),
+                          AirmassConstraint(max=1.3)])
+def test_months_observable_matches_full_grid(altitude_constraint):
+    subaru = Observer.at_site("Subaru")
+    targets = [FixedTarget(coord=SkyCoord(ra=ra*u.deg, dec=dec*u.deg))
+               for ra, dec in zip(np.linspace(0, 330, 12),
+                                  np.linspace(-60, 80, 12))]
+    constraints = [altitude_constraint,
+                   AtNightConstraint.twilight_astronomical()]
+    time_grid_resolution = 2*u.hour
+
+    # brute-force evaluation on every time of the grid
+    times = time_grid_from_range(Time(['2014-01-01', '2014-12-31']),
+                                 time_grid_resolution)
+    constraint_arr = np.logical_and.reduce(
+        [constraint(subaru, targets, times=times, grid_times_targets=True)
+         for constraint in constraints])
+    should_be = [set(t.datetime.month for t in times[observable])
+                 for observable in constraint_arr]
+
+    assert months_observable(constraints, subaru, targets,
+                             time_grid_resolution=time_grid_resolution) == \
+        should_be
+
+
+def test_months_observable_skips_targets_below_limit():
+    subaru = Observer.at_site("Subaru")
+    # never rises above 50 deg at the latitude of Subaru
+    target = FixedTarget(coord=SkyCoord(ra=0*u.deg, dec=-60*u.deg))
+    constraints = [CountingAltitudeConstraint(min=50*u.deg),
+                   AtNightConstraint.twilight_astronomical()]
+
+    CountingAltitudeConstraint.n_computed = 0
+    assert months_observable(constraints, subaru, [target],
+                             time_grid_resolution=2*u.hour) == [set()]
+    assert CountingAltitudeConstraint.n_computed == 0
+
+
 def test_rescale_minmax():
     a = np.array([2])
     rescaled = np.zeros(5)
@@ -393,6 +465,19 @@ def test_rescale_minmax():
     rescaled[4] = (max_best_rescale(a, 0, 1, greater_than_max=0))[0]
     assert all(np.array([0.8, 0.2, 1, 0, 0]) == rescaled)
 
+    # rescaling in place
+    vals = np.array([0.5, 1., 1.5, 2., 3.], dtype=np.float32)
+    expected = min_best_rescale(vals, 1, 2, less_than_min=0)
+    rescaled = min_best_rescale(vals, 1, 2, less_than_min=0, out=vals)
+    assert rescaled is vals
+    assert rescaled.dtype == np.float32
+    assert np.all(rescaled == expected)
+    assert np.all(rescaled == [0, 1, 0.5, 0, 0])
+
+    vals = np.array([20., 40., 70.])
+    assert max_best_rescale(vals, 35, 60, out=vals) is vals
+    assert np.allclose(vals, [0, 0.2, 1])
+
 
 constraint_tests = [
     AltitudeConstraint(),
@@ -432,6 +517,578 @@ def test_caches_shapes():
     assert ac(observer, targets, times, grid_times_targets=False).shape == (3,)
 
 
+def test_cache_key_digests():
+    times = Time('2015-08-28 03:30') + np.arange(1000) * u.min
+    ra = np.linspace(0, 350, 500) * u.deg
+    dec = np.linspace(-80, 80, 500) * u.deg
+    targets = SkyCoord(ra, dec)
+
+    key = _make_cache_key(times, targets)
+    # the key has a fixed size, regardless of the size of the grid
+    assert len(key) == len(_make_cache_key(times[:2], targets[:2]))
+    # equal inputs give equal keys
+    assert key == _make_cache_key(times.copy(),
+                                  SkyCoord(ra.copy(), dec.copy()))
+    # latitudes are part of the key, not only longitudes
+    shifted_dec = dec.copy()
+    shifted_dec[-1] -= 1 * u.deg
+    assert key != _make_cache_key(times, SkyCoord(ra, shifted_dec))
+    # so are the time scale and the frame
+    assert key != _make_cache_key(times.tt, targets)
+    assert key != _make_cache_key(times, targets.galactic)
+
+
+def test_altaz_sub_grid_reuse():
+    subaru = Observer.at_site("Subaru")
+    targets = [vega, rigel, polaris]
+    time_range = Time(["2015-08-01 06:00", "2015-08-01 12:00"])
+    constraint = AltitudeConstraint(min=30*u.deg)
+
+    fine = constraint(subaru, targets, time_range=time_range,
+                      time_grid_resolution=1*u.min, grid_times_targets=True)
+
+    def n_altaz_cached():
+        return len([key for key, value in subaru.cache.items()
+                    if key[0] == 'altaz'])
+    n_cached = n_altaz_cached()
+
+    # a coarser grid and a sub-window are sliced from the cached results
+    coarse = constraint(subaru, targets, time_range=time_range,
+                        time_grid_resolution=5*u.min, grid_times_targets=True)
+    fine_times = time_grid_from_range(time_range, 1*u.min)
+    window = constraint(subaru, targets, times=fine_times[60:180],
+                        grid_times_targets=True)
+    assert n_altaz_cached() == n_cached
+
+    assert np.all(coarse == fine[:, ::5])
+    assert np.all(window == fine[:, 60:180])
+
+    # and agree with a computation from scratch
+    fresh_observer = Observer.at_site("Subaru")
+    assert np.all(coarse == constraint(fresh_observer, targets,
+                                       time_range=time_range,
+                                       time_grid_resolution=5*u.min,
+                                       grid_times_targets=True))
+
+
+def test_altaz_sub_grid_not_reused_for_paired_targets():
+    subaru = Observer.at_site("Subaru")
+    times = time_grid_from_range(Time(["2015-08-01 06:00",
+                                       "2015-08-01 12:00"]))
+    targets = SkyCoord(ra=np.linspace(0, 300, len(times))*u.deg,
+                       dec=np.linspace(-20, 60, len(times))*u.deg)
+    constraint = AltitudeConstraint(min=20*u.deg, boolean_constraint=False)
+
+    # targets paired one-to-one with the times are not a grid of times
+    expected = constraint(Observer.at_site("Subaru"), targets,
+                          times=times[2:3])
+    constraint(subaru, targets, times=times)
+    sub_window = constraint(subaru, targets, times=times[2:3])
+    assert sub_window.shape == expected.shape
+    assert np.all(sub_window == expected)
+
+
+class RecordingAltitudeConstraint(AltitudeConstraint):
+    n_targets = []
+
+    def _get_altitudes(self, times, observer, targets):
+        RecordingAltitudeConstraint.n_targets.append(len(targets))
+        return super(RecordingAltitudeConstraint, self)._get_altitudes(
+            times, observer, targets)
+
+
+def test_declination_prefilter():
+    subaru = Observer.at_site("Subaru")
+    # never rises, circumpolar above 10 deg, and rising and setting
+    targets = SkyCoord(ra=[10, 10, 279.23]*u.deg, dec=[-80, 85, 38.78]*u.deg)
+    times = time_grid_from_range(Time(["2015-08-01 06:00",
+                                       "2015-08-02 06:00"]))
+    altitudes = subaru.altaz(times, targets, grid_times_targets=True).alt
+
+    RecordingAltitudeConstraint.n_targets = []
+    constraint = RecordingAltitudeConstraint(min=10*u.deg)
+    mask = constraint(subaru, targets, times=times, grid_times_targets=True)
+    assert np.all(mask == (altitudes >= 10*u.deg))
+    assert not np.any(mask[0]) and np.all(mask[1])
+    # only the rising and setting target is transformed
+    assert RecordingAltitudeConstraint.n_targets == [1]
+
+    airmass = AirmassConstraint(max=1/np.sin(10*u.deg))
+    assert np.all(airmass(subaru, targets, times=times,
+                          grid_times_targets=True) == mask)
+
+    # so are moving targets, and targets in other frames
+    RecordingAltitudeConstraint.n_targets = []
+    constraint(subaru, get_sun(times[0]), times=times,
+               grid_times_targets=True)
+    assert RecordingAltitudeConstraint.n_targets == [1]
+
+    assert np.all(is_observable(constraint, subaru, targets, times=times) ==
+                  [False, True, True])
+    assert np.all(is_always_observable(constraint, subaru, targets,
+                                       times=times) == [False, True, False])
+
+
+@pytest.mark.parametrize('pressure', [0, 600] * u.hPa)
+def test_fast_altitude_and_airmass(pressure):
+    subaru = Observer.at_site("Subaru", pressure=pressure)
+    targets = [vega, rigel, polaris]
+    times = time_grid_from_range(Time(["2015-08-01 06:00",
+                                       "2015-08-02 06:00"]),
+                                 time_resolution=10*u.min)
+
+    full_alt = AltitudeConstraint(boolean_constraint=False)
+    fast_alt = AltitudeConstraint(boolean_constraint=False, fast=True)
+    altaz = subaru.altaz(times, targets, grid_times_targets=True)
+    fast = fast_alt._get_altitudes(times, subaru,
+                                   get_skycoord(targets)[:, np.newaxis])
+    assert fast.shape == altaz.shape
+    above_horizon = altaz.alt > -5*u.deg
+    assert np.all(np.abs(fast - altaz.alt)[above_horizon] < 20*u.arcsec)
+
+    # the refraction models diverge well below the horizon
+    kwargs = dict(times=times, grid_times_targets=True)
+    assert np.allclose(fast_alt(subaru, targets, **kwargs)[above_horizon],
+                       full_alt(subaru, targets, **kwargs)[above_horizon],
+                       atol=1e-4)
+
+    # altitudes are rescaled to scores between min and max
+    scores = AltitudeConstraint(min=20*u.deg, max=60*u.deg,
+                                boolean_constraint=False)(subaru, targets,
+                                                          **kwargs)
+    assert not isinstance(scores, u.Quantity)
+    assert np.allclose(scores,
+                       np.clip(((altaz.alt - 20*u.deg) / (40*u.deg)).value,
+                               0, 1))
+
+    full_airmass = AirmassConstraint(max=2, boolean_constraint=False)
+    fast_airmass = AirmassConstraint(max=2, boolean_constraint=False,
+                                     fast=True)
+    assert np.allclose(fast_airmass(subaru, targets, **kwargs),
+                       full_airmass(subaru, targets, **kwargs), atol=1e-3)
+
+
+def test_pressure_is_not_mutated_by_threads():
+    subaru = Observer.at_site("Subaru", pressure=600*u.hPa,
+                              temperature=0*u.deg_C)
+    times = time_grid_from_range(Time(["2015-08-01 00:00",
+                                       "2015-08-02 00:00"]))
+    targets = [vega, rigel, polaris]
+    constraints = [AltitudeConstraint(min=20*u.deg, boolean_constraint=False),
+                   AtNightConstraint.twilight_civil()]
+
+    def evaluate(constraint):
+        return constraint(Observer.at_site("Subaru", pressure=600*u.hPa,
+                                           temperature=0*u.deg_C),
+                          targets, times=times, grid_times_targets=True)
+    serial = [evaluate(constraint) for constraint in constraints]
+
+    pool = ThreadPool(4)
+    results = pool.map(lambda constraint: constraint(
+        subaru, targets, times=times, grid_times_targets=True),
+        constraints * 4)
+    pool.close()
+    pool.join()
+
+    assert subaru.pressure == 600*u.hPa
+    for result, expected in zip(results, serial * 4):
+        assert np.all(result == expected)
+
+    # the cached alt/az coordinates follow changes of the atmosphere
+    altitudes = _get_altaz(times, subaru, vega)['altaz'].alt
+    subaru.pressure = 0*u.hPa
+    vacuum_altitudes = _get_altaz(times, subaru, vega)['altaz'].alt
+    assert np.all(vacuum_altitudes <= altitudes)
+    assert np.any(vacuum_altitudes < altitudes)
+
+
+def test_ephemeris_grid_shared_between_constraints():
+    subaru = Observer.at_site("Subaru")
+    targets = [vega, rigel, polaris]
+    times = time_grid_from_range(Time(["2015-08-01 06:00",
+                                       "2015-08-01 12:00"]))
+    constraints = [AtNightConstraint(), SunSeparationConstraint(min=30*u.deg),
+                   MoonSeparationConstraint(min=10*u.deg),
+                   MoonIlluminationConstraint(max=0.5)]
+    is_observable(constraints, subaru, targets, times=times)
+
+    # the Sun and Moon have been computed once, for all constraints
+    ephemeris_keys = [key[1] for key, value in subaru.cache.items()
+                      if key[0] == 'ephemeris']
+    assert ephemeris_keys.count('sun') == 1
+    assert ephemeris_keys.count('moon') == 1
+
+    grid = EphemerisGrid(times, subaru)
+    moon = get_moon(times, location=subaru.location)
+    assert np.all(grid.moon.separation(moon) < 1*u.arcsec)
+    assert np.allclose(grid.moon_illumination,
+                       subaru.moon_illumination(times))
+    assert np.all(grid.sun_altaz().alt == subaru.sun_altaz(times).alt)
+
+
+def test_fused_evaluation_matches_full_grid():
+    subaru = Observer.at_site("Subaru")
+    targets = [vega, rigel, polaris]
+    time_range = Time(["2015-08-01 06:00", "2015-08-02 06:00"])
+    constraints = [AltitudeConstraint(min=40*u.deg),
+                   AirmassConstraint(max=1.5, boolean_constraint=False),
+                   AtNightConstraint.twilight_civil(),
+                   MoonSeparationConstraint(min=30*u.deg)]
+
+    applied = np.logical_and.reduce([
+        constraint(subaru, targets, time_range=time_range,
+                   grid_times_targets=True)
+        for constraint in constraints])
+    assert np.all(is_observable(constraints, subaru, targets,
+                                time_range=time_range) ==
+                  np.any(applied, axis=1))
+    assert np.all(is_always_observable(constraints, subaru, targets,
+                                       time_range=time_range) ==
+                  np.all(applied, axis=1))
+    assert is_observable(constraints, subaru, vega,
+                         time_range=time_range).shape == (1,)
+
+    # targets that can no longer be observable are not transformed
+    fresh_observer = Observer.at_site("Subaru")
+    never = TimeConstraint(Time("2000-01-01"), Time("2000-01-02"))
+    assert not np.any(is_observable([AltitudeConstraint(min=40*u.deg), never],
+                                    fresh_observer, targets,
+                                    time_range=time_range))
+    assert not any(key[0] == 'altaz'
+                   for key, value in fresh_observer.cache.items())
+
+
+class CountingAltitudeConstraint(AltitudeConstraint):
+    n_computed = 0
+    n_evaluated = 0
+
+    def compute_constraint(self, times, observer, targets):
+        result = super(CountingAltitudeConstraint, self).compute_constraint(
+            times, observer, targets)
+        CountingAltitudeConstraint.n_computed += 1
+        CountingAltitudeConstraint.n_evaluated += np.size(result)
+        return result
+
+
+def test_constraint_algebra():
+    subaru = Observer.at_site("Subaru")
+    targets = [vega, rigel, polaris]
+    times = time_grid_from_range(Time(["2015-08-01 06:00",
+                                       "2015-08-02 06:00"]))
+    high = AltitudeConstraint(min=50*u.deg)
+    night = AtNightConstraint.twilight_civil()
+    moon = MoonSeparationConstraint(min=60*u.deg)
+
+    def apply(constraint):
+        return constraint(subaru, targets, times=times,
+                          grid_times_targets=True)
+
+    compound = (high & ~night) | moon
+    assert np.all(apply(compound) ==
+                  ((apply(high) & ~apply(night)) | apply(moon)))
+    assert np.all(apply(~~night) == apply(night))
+    assert np.all(is_observable(high & night, subaru, targets, times=times) ==
+                  is_observable([high, night], subaru, targets, times=times))
+
+    # identical leaves are evaluated once, within and across expressions
+    CountingAltitudeConstraint.n_computed = 0
+    low = CountingAltitudeConstraint(min=10*u.deg)
+    apply((low & night) | (CountingAltitudeConstraint(min=10*u.deg) & moon))
+    apply(moon & CountingAltitudeConstraint(min=10*u.deg))
+    assert CountingAltitudeConstraint.n_computed == 1
+    apply(moon & CountingAltitudeConstraint(min=20*u.deg))
+    assert CountingAltitudeConstraint.n_computed == 2
+
+
+def test_memoised_constraint_results():
+    subaru = Observer.at_site("Subaru")
+    targets = [vega, rigel, polaris]
+    times = time_grid_from_range(Time(["2015-08-01 06:00",
+                                       "2015-08-02 06:00"]))
+
+    def apply(constraint):
+        return constraint(subaru, targets, times=times,
+                          grid_times_targets=True)
+
+    # separate but identical instances share their results
+    CountingAltitudeConstraint.n_computed = 0
+    first = CountingAltitudeConstraint(min=30*u.deg)
+    second = CountingAltitudeConstraint(min=30*u.deg)
+    assert first.fingerprint == second.fingerprint
+    assert first.fingerprint != CountingAltitudeConstraint(
+        min=31*u.deg).fingerprint
+    assert np.all(apply(first) == apply(second))
+    assert CountingAltitudeConstraint.n_computed == 1
+
+    # the results are writable copies of the memoised results
+    mask = apply(first)
+    expected = mask.copy()
+    mask[:] = ~mask
+    assert np.all(apply(first) == expected)
+
+    # the results follow changes of the observer
+    subaru.pressure = 600*u.hPa
+    apply(second)
+    assert CountingAltitudeConstraint.n_computed == 2
+
+    # the fingerprints of objects without a custom repr are stable
+    def phase_constraint():
+        system = EclipsingSystem(primary_eclipse_time=Time('2016-01-01'),
+                                 orbital_period=1*u.day,
+                                 duration=1*u.hour)
+        return PhaseConstraint(system, min=0.2, max=0.4)
+    assert phase_constraint().fingerprint == phase_constraint().fingerprint
+
+    # coordinates are summarised from all of their data, not their repr
+    ra = np.linspace(0, 300, 5000)*u.deg
+    shifted = ra.copy()
+    shifted[2500] += 1*u.deg
+    first.coords = SkyCoord(ra, 0*u.deg)
+    second.coords = SkyCoord(shifted, 0*u.deg)
+    assert first.fingerprint != second.fingerprint
+
+    # and constraints with parameters which cannot be summarised are not
+    # memoised
+    unsummarised = CountingAltitudeConstraint(min=30*u.deg)
+    unsummarised.reduction = np.any
+    assert unsummarised.fingerprint is None
+    CountingAltitudeConstraint.n_computed = 0
+    assert np.all(apply(unsummarised) == apply(unsummarised))
+    assert CountingAltitudeConstraint.n_computed == 2
+
+
+def test_time_and_target_invariant_constraints():
+    subaru = Observer.at_site("Subaru")
+    times = time_grid_from_range(Time(["2015-08-01 06:00",
+                                       "2015-08-01 12:00"]))
+    other_times = time_grid_from_range(Time(["2015-08-02 06:00",
+                                             "2015-08-02 12:00"]))
+    galactic = GalacticLatitudeConstraint(min=20*u.deg)
+    night = AtNightConstraint()
+    assert not galactic.depends_on_time and galactic.depends_on_targets
+    assert night.depends_on_time and not night.depends_on_targets
+
+    static = galactic(subaru, [vega, rigel], times=times,
+                      grid_times_targets=True)
+    assert static.shape == (2, len(times))
+    assert np.all(static == galactic(subaru, [vega, rigel],
+                                     times=other_times,
+                                     grid_times_targets=True))
+    at_night = night(subaru, [vega, rigel], times=times,
+                     grid_times_targets=True)
+    assert np.all(at_night == night(subaru, [polaris], times=times,
+                                    grid_times_targets=True))
+    # computed once per set of targets, and once per grid of times
+    assert len([key for key, value in subaru.cache.items()
+                if key[0] == 'constraint']) == 2
+    assert not static.flags.writeable
+
+    # combined with broadcasting only
+    compound = galactic & night
+    assert compound.depends_on_time and compound.depends_on_targets
+    assert np.all(compound(subaru, [vega, rigel], times=times,
+                           grid_times_targets=True) == static & at_night)
+    assert np.all(is_observable([night, galactic], subaru, [vega, rigel],
+                                times=times) ==
+                  np.any(static & at_night, axis=1))
+
+
+def test_separation_dot_products():
+    subaru = Observer.at_site("Subaru")
+    targets = get_skycoord([vega, rigel, polaris])
+    times = time_grid_from_range(Time(["2015-08-01 06:00",
+                                       "2015-08-02 06:00"]))
+    sun = get_sun(times)
+    moon = get_moon(times, location=subaru.location)
+
+    for constraint, body in [(SunSeparationConstraint, sun),
+                             (MoonSeparationConstraint, moon)]:
+        # gridded targets and times
+        separation = body.separation(targets[:, np.newaxis])
+        limit = np.median(separation)
+        margin = np.abs(separation - limit) > 1*u.arcsec
+        for kwargs, expected in [(dict(min=limit), separation >= limit),
+                                 (dict(max=limit), separation <= limit)]:
+            mask = constraint(**kwargs)(subaru, targets, times=times,
+                                        grid_times_targets=True)
+            assert np.all(mask[margin] == expected[margin])
+
+        # targets and times broadcast against each other
+        separation = body.separation(targets[1])
+        median_constraint = constraint(min=np.median(separation))
+        mask = median_constraint(subaru, targets[1], times=times)
+        assert mask.shape == times.shape
+        assert np.all(mask == (separation >= np.median(separation)))
+
+
+def test_adaptive_grid():
+    subaru = Observer.at_site("Subaru")
+    targets = [vega, rigel, polaris]
+    kwargs = dict(time_range=Time(["2015-08-01 00:00", "2015-08-02 00:00"]),
+                  time_grid_resolution=5*u.min)
+    constraints = [AltitudeConstraint(min=40*u.deg),
+                   AtNightConstraint.twilight_civil()]
+
+    for function in [is_observable, is_always_observable]:
+        assert np.all(function(constraints, subaru, targets, adaptive=True,
+                               **kwargs) ==
+                      function(constraints, subaru, targets, **kwargs))
+
+    full = observability_table(constraints, subaru, targets, **kwargs)
+    for adaptive in [True, 4, 20]:
+        table = observability_table(constraints, subaru, targets,
+                                    adaptive=adaptive, **kwargs)
+        for column in full.colnames:
+            assert np.all(table[column] == full[column])
+
+    # only the windows and their edges are evaluated at full resolution
+    CountingAltitudeConstraint.n_evaluated = 0
+    counting = CountingAltitudeConstraint(min=40*u.deg)
+    observability_table([counting], Observer.at_site("Subaru"), targets,
+                        adaptive=True, **kwargs)
+    assert CountingAltitudeConstraint.n_evaluated < full['target name'].size * \
+        len(full.meta['times']) / 2
+
+
+def test_chunked_observability_table():
+    subaru = Observer.at_site("Subaru")
+    targets = [vega, rigel, polaris]
+    time_range = Time("2015-08-01 06:00")
+    constraints = [AltitudeConstraint(min=40*u.deg),
+                   AtNightConstraint.twilight_civil()]
+
+    full = observability_table(constraints, subaru, targets,
+                               time_range=time_range)
+    chunked = observability_table(constraints, subaru, targets,
+                                  time_range=time_range, chunk_size=2)
+    assert chunked.colnames == full.colnames
+    for column in full.colnames:
+        assert np.all(chunked[column] == full[column])
+    assert np.all(chunked.meta['times'] == full.meta['times'])
+
+    chunks = list(iter_observability_table(constraints, subaru, targets,
+                                           time_range=time_range,
+                                           chunk_size=2))
+    assert [len(chunk) for chunk in chunks] == [2, 1]
+    assert list(chunks[1]['target name']) == ['Polaris']
+    assert chunks[1].meta['observer'] is subaru
+
+
+def test_packed_evaluation():
+    subaru = Observer.at_site("Subaru")
+    targets = [vega, rigel, polaris]
+    kwargs = dict(time_range=Time(["2015-08-01 00:00", "2015-08-02 00:00"]),
+                  time_grid_resolution=7*u.min)
+    constraints = [AltitudeConstraint(min=40*u.deg),
+                   AtNightConstraint.twilight_civil(),
+                   GalacticLatitudeConstraint(min=5*u.deg)]
+
+    times = time_grid_from_range(kwargs['time_range'],
+                                 kwargs['time_grid_resolution'])
+    assert len(times) % 8 != 0
+    for constraint in constraints:
+        result = constraint(subaru, targets, times=times,
+                            grid_times_targets=True)
+        packed = constraint(subaru, targets, times=times,
+                            grid_times_targets=True, packed=True)
+        assert packed.dtype == np.uint8
+        assert np.all(np.unpackbits(packed, axis=1)[:, :len(times)] == result)
+
+    with pytest.raises(ValueError):
+        AltitudeConstraint(min=40*u.deg, boolean_constraint=False)(
+            subaru, targets, times=times, packed=True)
+
+    for function in [is_observable, is_always_observable]:
+        assert np.all(function(constraints, subaru, targets, packed=True,
+                               **kwargs) ==
+                      function(constraints, subaru, targets, **kwargs))
+    # the padding bits of the packed arrays are ignored
+    night = Time("2015-08-01 10:00") + np.arange(5)*u.min
+    assert np.all(is_always_observable(AtNightConstraint(), subaru, targets,
+                                       times=night, packed=True))
+
+    full = observability_table(constraints, subaru, targets, **kwargs)
+    packed = observability_table(constraints, subaru, targets, packed=True,
+                                 **kwargs)
+    for column in full.colnames:
+        assert np.all(packed[column] == full[column])
+
+
+def test_sharded_evaluation():
+    subaru = Observer.at_site("Subaru")
+    targets = [vega, rigel, polaris]
+    kwargs = dict(time_range=Time(["2015-08-01 00:00", "2015-08-02 00:00"]))
+    constraints = [AltitudeConstraint(min=40*u.deg),
+                   AtNightConstraint.twilight_civil()]
+
+    for function in [is_observable, is_always_observable]:
+        assert np.all(function(constraints, subaru, targets, n_jobs=2,
+                               **kwargs) ==
+                      function(constraints, subaru, targets, **kwargs))
+
+    full = observability_table(constraints, subaru, targets, **kwargs)
+    sharded = observability_table(constraints, subaru, targets, n_jobs=2,
+                                  chunk_size=1, **kwargs)
+    for column in full.colnames:
+        assert np.all(sharded[column] == full[column])
+
+
+def test_observability_windows():
+    subaru = Observer.at_site("Subaru")
+    targets = [vega, rigel, polaris]
+    time_range = Time(["2015-08-01 00:00", "2015-08-03 00:00"])
+    constraints = [AltitudeConstraint(min=40*u.deg),
+                   AtNightConstraint.twilight_civil()]
+    precision = 1*u.min
+
+    offsets, starts, ends = observability_windows(
+        constraints, subaru, targets, time_range, precision=precision)
+    assert len(offsets) == len(targets) + 1
+    assert len(starts) == len(ends) == offsets[-1]
+    assert np.all(ends >= starts)
+
+    # the constraints are met at the edges of the windows, and not just
+    # outside of them
+    coords = get_skycoord(targets)[np.repeat(np.arange(len(targets)),
+                                             np.diff(offsets))]
+
+    def combined(times):
+        return np.logical_and.reduce([constraint(subaru, coords, times=times)
+                                      for constraint in constraints])
+
+    assert np.all(combined(starts))
+    assert np.all(combined(ends))
+    times = time_grid_from_range(time_range)
+    assert not np.any(combined(starts - precision)[starts > times[0]])
+    assert not np.any(combined(ends + precision)[ends < times[-1]])
+
+    # there is one window per night for each target observable at night
+    table = observability_table(constraints, subaru, targets,
+                                time_range=time_range)
+    assert np.all((np.diff(offsets) > 0) == table['ever observable'])
+    assert np.all(np.diff(offsets) <= 2)
+
+    adaptive = observability_windows(constraints, subaru, targets, time_range,
+                                     precision=precision, adaptive=True)
+    assert np.all(adaptive[0] == offsets)
+    assert np.all(np.abs((adaptive[1] - starts).to(u.min)) < precision)
+    assert np.all(np.abs((adaptive[2] - ends).to(u.min)) < precision)
+
+    # the targets are evaluated in chunks with the same result
+    chunked = observability_windows(constraints, subaru, targets, time_range,
+                                    precision=precision, chunk_size=2)
+    assert np.all(chunked[0] == offsets)
+    assert np.all(chunked[1] == starts)
+    assert np.all(chunked[2] == ends)
+
+    # windows which extend to the edges of the grid of times
+    offsets, starts, ends = observability_windows(
+        AltitudeConstraint(min=10*u.deg), subaru, polaris, time_range)
+    assert np.all(offsets == [0, 1])
+    assert np.abs((starts[0] - times[0]).to(u.s)) < 1*u.s
+    assert np.abs((ends[0] - times[-1]).to(u.s)) < 1*u.s
+
+
 def test_eclipses():
     subaru = Observer.at_site("Subaru")
 
@@ -452,6 +1109,10 @@ def test_eclipses():
     times = Time(['2016-01-01 00:00', '2016-01-02 12:00', '2016-01-02 14:00'])
     assert np.all(np.array([False, True, False]) == pc(subaru, None, times))
 
+    # the phases of each grid of times are shared between the constraints
+    assert len([key for key, value in subaru.cache.items()
+                if key[0] == 'phase']) == 2
+
 
 def test_event_observable():
 
@@ -492,3 +1153,47 @@ def test_event_observable():
                     False]]
 
     assert np.all(observable == np.array(cetd_answer))
+
+
+def test_event_observability_table():
+    apo = Observer.at_site('APO')
+    systems = [EclipsingSystem(primary_eclipse_time=Time(2452826.628514, format='jd'),
+                               orbital_period=3.52474859*u.day,
+                               duration=0.1277*u.day, name='HD 209458 b'),
+               EclipsingSystem(primary_eclipse_time=Time(2454279.436714, format='jd'),
+                               orbital_period=2.21857567*u.day,
+                               duration=0.0760*u.day, name='HD 189733 b')]
+    targets = [SkyCoord(330.79488*u.deg, 18.88432*u.deg),
+               SkyCoord(300.18213*u.deg, 22.70972*u.deg)]
+    observing_time = Time('2017-09-15 10:20')
+    time_range = Time([observing_time, observing_time + 30*u.day])
+    constraints = [AltitudeConstraint(min=0*u.deg), AtNightConstraint()]
+
+    table = event_observability_table(constraints, apo, systems, targets,
+                                      time_range)
+    for i, (system, target) in enumerate(zip(systems, targets)):
+        rows = table[table['system index'] == i]
+        n_eclipses = int(30*u.day / system.period)
+        assert n_eclipses <= len(rows) <= n_eclipses + 1
+        assert np.all(rows['system name'] == system.name)
+        assert np.all(rows['mid-eclipse'] <= time_range[1])
+
+        # same events and observability as for a single system
+        ing_egr = system.next_primary_ingress_egress_time(time_range[0],
+                                                          n_eclipses=len(rows))
+        assert np.all(np.abs((rows['ingress'] - ing_egr[:, 0]).to(u.s)) < 1*u.s)
+        assert np.all(np.abs((rows['egress'] - ing_egr[:, 1]).to(u.s)) < 1*u.s)
+        observable = is_event_observable(constraints, apo, target,
+                                         times_ingress_egress=ing_egr)[0]
+        assert np.all((rows['observable at ingress'] &
+                       rows['observable at egress']) == observable)
+        assert np.all(rows['observable'] ==
+                      (observable & rows['observable at mid-eclipse']))
+
+    secondary = event_observability_table(constraints, apo, systems[:1],
+                                          targets[:1], time_range,
+                                          eclipse='secondary')
+    mid_eclipses = systems[0].next_secondary_eclipse_time(
+        time_range[0], n_eclipses=len(secondary))
+    assert np.all(np.abs((secondary['mid-eclipse'] - mid_eclipses).to(u.s)) <
+                  1*u.s)
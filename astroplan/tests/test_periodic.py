@@ -22,6 +22,21 @@ def test_phase():
     assert pe.phase(Time('2016-01-04 00:00')) == 0.0
 
 
+def test_phase_matches_time_arithmetic():
+    epoch = Time(2452826.628514, format='jd')
+    period = 3.52474859*u.day
+    times = Time('2017-09-15 10:20') + np.linspace(0, 1000, 1001)*u.day
+    expected = ((times - epoch).to(u.day).value %
+                period.to(u.day).value) / period.to(u.day).value
+
+    pe = PeriodicEvent(epoch=epoch, period=period)
+    assert_allclose(pe.phase(times), expected, rtol=0, atol=1e-12)
+
+    # times are converted to the time scale of the epoch
+    pe = PeriodicEvent(epoch=epoch.tdb, period=period)
+    assert_allclose(pe.phase(times), expected, rtol=0, atol=1e-7)
+
+
 def test_primary_secondary_eclipse():
     epoch = Time('2016-01-01 00:00')
     period = 3*u.day
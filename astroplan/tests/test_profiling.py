@@ -0,0 +1,48 @@
+# Licensed under a 3-clause BSD style license - see LICENSE.rst
+from __future__ import (absolute_import, division, print_function,
+                        unicode_literals)
+
+import numpy as np
+import astropy.units as u
+from astropy.time import Time
+from astropy.coordinates import SkyCoord
+
+from ..observer import Observer
+from ..constraints import (AltitudeConstraint, AtNightConstraint,
+                           is_observable)
+from ..profiling import Profiler, _profilers
+
+
+def test_profiler():
+    subaru = Observer.at_site("Subaru")
+    times = Time('2015-08-01 06:00') + np.arange(10) * u.hour
+    targets = [SkyCoord(279.23*u.deg, 38.78*u.deg),
+               SkyCoord(78.63*u.deg, -8.20*u.deg)]
+    constraints = [AltitudeConstraint(min=30*u.deg), AtNightConstraint()]
+
+    with Profiler() as profiler:
+        is_observable(constraints, subaru, targets, times=times)
+        is_observable(constraints, subaru, targets, times=times)
+    assert not _profilers
+
+    stats = profiler.stats
+    altitude = stats['AltitudeConstraint']
+    assert altitude['calls'] == 1
+    assert altitude['misses'] == 1
+    assert altitude['hits'] == 1
+    assert 0 < altitude['cells'] <= len(targets) * len(times)
+    assert altitude['time'] > 0
+    assert stats['AtNightConstraint']['calls'] == 1
+    assert stats['Observer.altaz']['calls'] >= 1
+    assert stats['cache:constraint']['hits'] >= 2
+
+    table = profiler.to_table()
+    assert set(table['name']) == set(stats)
+    assert table['time'].unit == u.s
+
+    # nothing is recorded outside of the profiler context
+    subaru.altaz(times, targets[0])
+    assert profiler.stats == stats
+
+    profiler.reset()
+    assert profiler.stats == {}
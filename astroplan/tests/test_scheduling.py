@@ -11,6 +11,7 @@ from ..utils import time_grid_from_range
 from ..observer import Observer
 from ..target import FixedTarget, get_skycoord
 from ..constraints import (AirmassConstraint, AtNightConstraint, _get_altaz,
+                           AltitudeConstraint,
                            MoonIlluminationConstraint, PhaseConstraint)
 from ..periodic import EclipsingSystem
 from ..scheduling import (ObservingBlock, PriorityScheduler, SequentialScheduler,
@@ -302,3 +303,36 @@ def test_scorer():
     scores = scorer.create_score_array(time_resolution=20 * u.minute)
     # the ``global_constraint``: constraint2 should have applied to the blocks
     assert np.array_equal(c2, scores)
+
+    # sharding the blocks between worker processes gives the same scores
+    block = ObservingBlock(vega, 1*u.hour, 0, constraints=[constraint])
+    scorer = Scorer.from_start_end([block, block2, block], apo,
+                                   Time('2016-02-06 00:00'),
+                                   Time('2016-02-06 08:00'), [constraint2])
+    assert np.array_equal(
+        scorer.create_score_array(time_resolution=20 * u.minute, n_jobs=2),
+        scorer.create_score_array(time_resolution=20 * u.minute))
+
+    single = scorer.create_score_array(time_resolution=20 * u.minute,
+                                       dtype=np.float32)
+    assert single.dtype == np.float32
+    assert np.allclose(single, scorer.create_score_array(
+        time_resolution=20 * u.minute), atol=1e-6)
+
+
+def test_scorer_with_altitude_scores():
+    altitude = AltitudeConstraint(min=20*u.deg, max=60*u.deg,
+                                  boolean_constraint=False)
+    times = time_grid_from_range(Time(['2016-02-06 00:00', '2016-02-06 08:00']),
+                                 time_resolution=20*u.minute)
+    alt = apo.altaz(times, [vega, rigel], grid_times_targets=True).alt
+    expected = np.clip(((alt - 20*u.deg) / (40*u.deg)).value, 0, 1)
+
+    blocks = [ObservingBlock(vega, 1*u.hour, 0),
+              ObservingBlock(rigel, 1*u.hour, 0)]
+    scorer = Scorer.from_start_end(blocks, apo, Time('2016-02-06 00:00'),
+                                   Time('2016-02-06 08:00'), [altitude])
+    for kwargs in [dict(), dict(dtype=np.float32), dict(n_jobs=2)]:
+        scores = scorer.create_score_array(time_resolution=20*u.minute,
+                                           **kwargs)
+        assert np.allclose(scores, expected, atol=1e-6)
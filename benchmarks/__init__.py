@@ -0,0 +1,76 @@
+# Licensed under a 3-clause BSD style license - see LICENSE.rst
+"""
+Benchmarks of astroplan, for `airspeed velocity
+<https://asv.readthedocs.io>`_.
+
+The benchmarks run without network access: the observatory sites are those
+of `~astroplan.utils.EarthLocation_mock`, and the IERS tables are not
+downloaded. To run the benchmarks of the current commit, from the root of
+the repository::
+
+    pip install asv
+    asv run
+
+and to compare the performance of two commits::
+
+    asv continuous master HEAD
+
+Each benchmark class is parameterised on scaling axes, such as the number of
+targets, the length of the time grid, the number of constraints or the number
+of observing blocks. The cache of the observer is cleared before each timed
+call, so that the benchmarks measure complete computations rather than
+lookups of memoised results.
+"""
+
+from __future__ import (absolute_import, division, print_function,
+                        unicode_literals)
+
+# Third-party
+import numpy as np
+import astropy.units as u
+from astropy.coordinates import SkyCoord
+from astropy.time import Time
+from astropy.utils import iers
+
+# Package
+from astroplan import Observer, FixedTarget
+from astroplan.utils import _mock_remote_data
+
+iers.conf.auto_download = False
+_mock_remote_data()
+
+# Start of the night of 2016-02-05 at Apache Point Observatory
+START_TIME = Time('2016-02-06 01:00:00')
+
+
+def make_observer(site='apo'):
+    """
+    Observer at one of the mocked sites.
+    """
+    return Observer.at_site(site)
+
+
+def make_coords(n_targets, seed=42):
+    """
+    ``n_targets`` coordinates spread uniformly over the sky.
+    """
+    random = np.random.RandomState(seed)
+    ra = random.uniform(0, 360, n_targets) * u.deg
+    dec = np.degrees(np.arcsin(random.uniform(-1, 1, n_targets))) * u.deg
+    return SkyCoord(ra, dec)
+
+
+def make_targets(n_targets, seed=42):
+    """
+    ``n_targets`` `~astroplan.FixedTarget` objects spread uniformly over the
+    sky.
+    """
+    return [FixedTarget(coord=coord, name='target{0}'.format(i))
+            for i, coord in enumerate(make_coords(n_targets, seed))]
+
+
+def make_times(n_times, duration=24*u.hour):
+    """
+    Grid of ``n_times`` times spanning ``duration`` from `START_TIME`.
+    """
+    return START_TIME + np.linspace(0, 1, n_times) * duration
@@ -0,0 +1,99 @@
+# Licensed under a 3-clause BSD style license - see LICENSE.rst
+"""
+Benchmarks of the evaluation of constraints and of the observability
+functions.
+"""
+
+from __future__ import (absolute_import, division, print_function,
+                        unicode_literals)
+
+# Third-party
+import astropy.units as u
+
+# Package
+from astroplan import (AltitudeConstraint, AirmassConstraint,
+                       AtNightConstraint, MoonSeparationConstraint,
+                       MoonIlluminationConstraint, SunSeparationConstraint,
+                       is_observable, is_always_observable,
+                       observability_table)
+
+from . import make_observer, make_coords, make_times
+
+
+def make_constraints():
+    """
+    Constraints in order of increasing cost.
+    """
+    return [AtNightConstraint.twilight_astronomical(),
+            AltitudeConstraint(min=30*u.deg),
+            AirmassConstraint(max=2),
+            SunSeparationConstraint(min=45*u.deg),
+            MoonSeparationConstraint(min=30*u.deg),
+            MoonIlluminationConstraint(max=0.6)]
+
+
+class TimeConstraintCall(object):
+    """
+    ``Constraint.__call__`` on a grid of times and targets.
+    """
+    params = ([1, 100, 1000], [24, 240, 2400])
+    param_names = ['n_targets', 'n_times']
+    timeout = 300
+
+    def setup(self, n_targets, n_times):
+        self.observer = make_observer()
+        self.targets = make_coords(n_targets)
+        self.times = make_times(n_times)
+
+    def _call(self, constraint):
+        self.observer.cache.clear()
+        constraint(self.observer, self.targets, self.times,
+                   grid_times_targets=True)
+
+    def time_altitude(self, n_targets, n_times):
+        self._call(AltitudeConstraint(min=30*u.deg))
+
+    def time_altitude_fast(self, n_targets, n_times):
+        self._call(AltitudeConstraint(min=30*u.deg, fast=True))
+
+    def time_airmass(self, n_targets, n_times):
+        self._call(AirmassConstraint(max=2))
+
+    def time_at_night(self, n_targets, n_times):
+        self._call(AtNightConstraint.twilight_astronomical())
+
+    def time_moon_separation(self, n_targets, n_times):
+        self._call(MoonSeparationConstraint(min=30*u.deg))
+
+    def time_moon_illumination(self, n_targets, n_times):
+        self._call(MoonIlluminationConstraint(max=0.6))
+
+
+class TimeObservability(object):
+    """
+    Observability functions with an increasing number of constraints.
+    """
+    params = ([1, 3, 6], [10, 100, 1000], [48, 480])
+    param_names = ['n_constraints', 'n_targets', 'n_times']
+    timeout = 300
+
+    def setup(self, n_constraints, n_targets, n_times):
+        self.observer = make_observer()
+        self.constraints = make_constraints()[:n_constraints]
+        self.targets = make_coords(n_targets)
+        self.times = make_times(n_times)
+
+    def time_is_observable(self, n_constraints, n_targets, n_times):
+        self.observer.cache.clear()
+        is_observable(self.constraints, self.observer, self.targets,
+                      times=self.times)
+
+    def time_is_always_observable(self, n_constraints, n_targets, n_times):
+        self.observer.cache.clear()
+        is_always_observable(self.constraints, self.observer, self.targets,
+                             times=self.times)
+
+    def time_observability_table(self, n_constraints, n_targets, n_times):
+        self.observer.cache.clear()
+        observability_table(self.constraints, self.observer, self.targets,
+                            times=self.times)
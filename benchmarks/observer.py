@@ -0,0 +1,77 @@
+# Licensed under a 3-clause BSD style license - see LICENSE.rst
+"""
+Benchmarks of the coordinate transformations and the rise/set/transit
+solvers of `~astroplan.Observer`.
+"""
+
+from __future__ import (absolute_import, division, print_function,
+                        unicode_literals)
+
+# Third-party
+import astropy.units as u
+
+from . import START_TIME, make_observer, make_coords, make_times
+
+
+class TimeAltAz(object):
+    """
+    ``Observer.altaz`` on a grid of times and targets.
+    """
+    params = ([1, 100, 1000], [24, 240, 2400])
+    param_names = ['n_targets', 'n_times']
+    timeout = 300
+
+    def setup(self, n_targets, n_times):
+        self.observer = make_observer()
+        self.targets = make_coords(n_targets)
+        self.times = make_times(n_times)
+
+    def time_altaz(self, n_targets, n_times):
+        self.observer.altaz(self.times, self.targets, grid_times_targets=True)
+
+    def time_sun_altaz(self, n_targets, n_times):
+        self.observer.sun_altaz(self.times)
+
+    def time_moon_altaz(self, n_targets, n_times):
+        self.observer.moon_altaz(self.times)
+
+
+class TimeRiseSet(object):
+    """
+    Rise, set and transit solvers for an increasing number of targets.
+    """
+    params = ([1, 10, 100], ['next', 'nearest'])
+    param_names = ['n_targets', 'which']
+
+    def setup(self, n_targets, which):
+        self.observer = make_observer()
+        self.targets = make_coords(n_targets)
+
+    def time_target_rise_time(self, n_targets, which):
+        self.observer.target_rise_time(START_TIME, self.targets, which=which)
+
+    def time_target_set_time(self, n_targets, which):
+        self.observer.target_set_time(START_TIME, self.targets, which=which,
+                                      horizon=-12*u.deg)
+
+    def time_target_meridian_transit_time(self, n_targets, which):
+        self.observer.target_meridian_transit_time(START_TIME, self.targets,
+                                                   which=which)
+
+
+class TimeTwilight(object):
+    """
+    Twilight and sun rise/set times for an increasing number of times.
+    """
+    params = [1, 10, 100]
+    param_names = ['n_times']
+
+    def setup(self, n_times):
+        self.observer = make_observer()
+        self.times = make_times(n_times, duration=n_times*u.day)
+
+    def time_sun_set_time(self, n_times):
+        self.observer.sun_set_time(self.times, which='next')
+
+    def time_twilight_evening_astronomical(self, n_times):
+        self.observer.twilight_evening_astronomical(self.times, which='next')
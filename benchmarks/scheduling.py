@@ -0,0 +1,77 @@
+# Licensed under a 3-clause BSD style license - see LICENSE.rst
+"""
+Benchmarks of the schedulers and of the scoring of observing blocks.
+"""
+
+from __future__ import (absolute_import, division, print_function,
+                        unicode_literals)
+
+# Third-party
+import astropy.units as u
+
+# Package
+from astroplan import (AirmassConstraint, AtNightConstraint,
+                       MoonSeparationConstraint)
+from astroplan.scheduling import (ObservingBlock, PriorityScheduler,
+                                  SequentialScheduler, Transitioner,
+                                  Schedule, Scorer)
+
+from . import START_TIME, make_observer, make_targets
+
+SCHEDULERS = {'priority': PriorityScheduler,
+              'sequential': SequentialScheduler}
+
+
+def make_blocks(n_blocks):
+    """
+    Observing blocks of 20 minutes on ``n_blocks`` targets, with airmass and
+    Moon separation constraints.
+    """
+    constraints = [AirmassConstraint(max=3, boolean_constraint=False),
+                   MoonSeparationConstraint(min=20*u.deg)]
+    return [ObservingBlock(target, 20*u.minute, i, constraints=constraints)
+            for i, target in enumerate(make_targets(n_blocks))]
+
+
+class TimeScheduler(object):
+    """
+    Schedulers on a night of observations for an increasing number of
+    observing blocks.
+    """
+    params = ([10, 30, 100], ['priority', 'sequential'])
+    param_names = ['n_blocks', 'scheduler']
+    timeout = 600
+
+    def setup(self, n_blocks, scheduler):
+        self.observer = make_observer()
+        self.blocks = make_blocks(n_blocks)
+        self.scheduler = SCHEDULERS[scheduler](
+            constraints=[AtNightConstraint.twilight_astronomical()],
+            observer=self.observer,
+            transitioner=Transitioner(slew_rate=0.8*u.deg/u.second),
+            time_resolution=5*u.minute)
+
+    def time_schedule(self, n_blocks, scheduler):
+        self.observer.cache.clear()
+        schedule = Schedule(START_TIME, START_TIME + 12*u.hour)
+        self.scheduler(self.blocks, schedule)
+
+
+class TimeScorer(object):
+    """
+    ``Scorer.create_score_array`` for an increasing number of observing
+    blocks and time resolutions.
+    """
+    params = ([10, 100, 1000], [1, 5, 20])
+    param_names = ['n_blocks', 'time_resolution']
+    timeout = 300
+
+    def setup(self, n_blocks, time_resolution):
+        self.observer = make_observer()
+        self.scorer = Scorer(make_blocks(n_blocks), self.observer,
+                             Schedule(START_TIME, START_TIME + 12*u.hour),
+                             global_constraints=[AtNightConstraint()])
+
+    def time_create_score_array(self, n_blocks, time_resolution):
+        self.observer.cache.clear()
+        self.scorer.create_score_array(time_resolution*u.minute)